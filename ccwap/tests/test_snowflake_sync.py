@@ -0,0 +1,461 @@
+"""
+Tests for the SQLite side of snowflake_sync.
+
+Covers the read-ahead reader thread, id paging, progress output,
+dependency ordering, pending-row counts, the sessions load, the
+sync_tables scheduler, --watch passes and .env parsing. Nothing here
+talks to Snowflake.
+"""
+
+import unittest
+import tempfile
+import io
+import sqlite3
+import graphlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from contextlib import ExitStack, closing, redirect_stdout
+from unittest.mock import MagicMock, patch
+
+# Add repo root to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import snowflake_sync
+from snowflake_sync import (
+    TABLE_CONFIG, get_pending_counts, iter_id_pages, load_dotenv, print_progress,
+    read_ahead, tracking_progress,
+)
+
+
+def reader_threads():
+    """Return the read-ahead threads that are still running."""
+    return [t for t in threading.enumerate() if t.name == 'sqlite-read-ahead']
+
+
+class TestReadAhead(unittest.TestCase):
+    """Test the background reader used by iter_batches and iter_id_pages."""
+
+    def test_yields_batches_in_order(self):
+        """Every batch comes through, in order."""
+        batches = [[(i,)] for i in range(10)]
+        self.assertEqual(list(read_ahead(iter(batches), depth=2)), batches)
+        self.assertEqual(reader_threads(), [])
+
+    def test_early_exit_joins_reader(self):
+        """Closing the consumer stops and joins the reader thread."""
+        produced = []
+
+        def endless():
+            i = 0
+            while True:
+                produced.append(i)
+                yield [(i,)]
+                i += 1
+
+        batches = read_ahead(endless(), depth=2)
+        self.assertEqual(next(batches), [(0,)])
+        batches.close()
+
+        self.assertEqual(reader_threads(), [])
+        # The reader stopped instead of draining the source
+        self.assertLess(len(produced), 10)
+
+    def test_consumer_error_closes_reader_and_source(self):
+        """A failing consumer under closing() leaves no reader or open source."""
+        closed = []
+
+        def source():
+            try:
+                for i in range(100):
+                    yield [(i,)]
+            finally:
+                closed.append(threading.current_thread().name)
+
+        with self.assertRaises(RuntimeError):
+            with closing(read_ahead(source(), depth=2)) as batches:
+                for batch in batches:
+                    raise RuntimeError("PUT failed")
+
+        self.assertEqual(reader_threads(), [])
+        # The source is closed on the reader thread, before it is joined
+        self.assertEqual(closed, ['sqlite-read-ahead'])
+
+    def test_iter_batches_closes_cursor(self):
+        """Stopping early closes the SQLite cursor before returning."""
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.addCleanup(conn.close)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO items VALUES (?)", [(i,) for i in range(100)])
+        cur = conn.execute("SELECT id FROM items ORDER BY id")
+
+        with closing(snowflake_sync.iter_batches(cur, 10)) as batches:
+            self.assertEqual(len(next(batches)), 10)
+
+        self.assertEqual(reader_threads(), [])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            cur.fetchone()  # cannot operate on a closed cursor
+
+    def test_read_error_reraised_in_consumer(self):
+        """An error raised while reading surfaces in the consuming thread."""
+        def failing():
+            yield [(1,)]
+            raise sqlite3.OperationalError("database is locked")
+
+        batches = read_ahead(failing())
+        self.assertEqual(next(batches), [(1,)])
+        with self.assertRaises(sqlite3.OperationalError):
+            next(batches)
+        self.assertEqual(reader_threads(), [])
+
+
+class TestIterIdPages(unittest.TestCase):
+    """Test keyset paging over a temp SQLite database."""
+
+    PAGE_SQL = "SELECT id, value FROM items WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+
+    def setUp(self):
+        """Create a table whose ids have gaps."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / 'test.db'
+        # Pages are read on the read-ahead thread
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+        self.ids = [1, 2, 5, 6, 7, 10, 11, 20]
+        self.conn.executemany(
+            "INSERT INTO items (id, value) VALUES (?, ?)",
+            [(i, f"v{i}") for i in self.ids],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up."""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def page_ids(self, last_id, high_id, batch_size):
+        return [[row[0] for row in page]
+                for page in iter_id_pages(self.conn, self.PAGE_SQL,
+                                          last_id, high_id, batch_size)]
+
+    def test_pages_follow_ids_across_gaps(self):
+        """Each page starts after the last id of the previous one."""
+        self.assertEqual(self.page_ids(1, 11, 2), [[2, 5], [6, 7], [10, 11]])
+
+    def test_high_id_is_inclusive_upper_bound(self):
+        """Rows above high_id are left for the next run."""
+        self.assertEqual(self.page_ids(0, 10, 4), [[1, 2, 5, 6], [7, 10]])
+
+    def test_high_id_inside_gap(self):
+        """A bound that falls in a gap ends on the last existing id."""
+        self.assertEqual(self.page_ids(2, 15, 3), [[5, 6, 7], [10, 11]])
+
+    def test_nothing_pending(self):
+        """No query results when last_id has reached high_id."""
+        self.assertEqual(self.page_ids(20, 20, 5), [])
+        self.assertEqual(self.page_ids(11, 19, 5), [])
+
+    def test_table_config_page_sql(self):
+        """The configured page_sql binds (last_id, high_id, limit) in order."""
+        page_sql = TABLE_CONFIG['snapshots']['page_sql']
+        self.assertTrue(page_sql.endswith("WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"))
+
+
+class TestPrintProgress(unittest.TestCase):
+    """Test progress output, including the '~' upper-bound estimate."""
+
+    def setUp(self):
+        patcher = patch.dict(snowflake_sync._progress_printed_at, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def capture(self, updates, tables=1):
+        """Run print_progress calls with tables syncing; return the output."""
+        out = io.StringIO()
+        with redirect_stdout(out), ExitStack() as stack:
+            for _ in range(tables):
+                stack.enter_context(tracking_progress())
+            for args, kwargs in updates:
+                print_progress(*args, **kwargs)
+        return out.getvalue()
+
+    def test_approx_updates_in_place_then_exact_final_line(self):
+        """A single table shows '~estimate' in place, then the exact count."""
+        output = self.capture([
+            (('turns', 100, 250), {'approx': True}),
+            (('turns', 250, 250), {'approx': True}),
+            (('turns', 240, 240), {}),
+        ])
+        self.assertEqual(output.split('\r'), [
+            '',
+            '  turns                     100/~250 ( 40.0%)',
+            '  turns                     250/~250 (100.0%)',
+            '  turns                     240/240 (100.0%)\n',
+        ])
+
+    def test_approx_throttled_while_tables_run_concurrently(self):
+        """Concurrent tables print full '~' lines, throttled per table."""
+        output = self.capture([
+            (('turns', 100, 250), {'approx': True}),
+            (('turns', 200, 250), {'approx': True}),  # within the interval
+            (('snapshots', 5, 9), {'approx': True}),
+            (('turns', 240, 240), {}),
+        ], tables=2)
+        self.assertEqual(output, (
+            '  turns                     100/~250 ( 40.0%)\n'
+            '  snapshots                   5/~9 ( 55.6%)\n'
+            '\r  turns                     240/240 (100.0%)\n'
+        ))
+
+
+class TestDependencyLevels(unittest.TestCase):
+    """Test grouping tables by their depends_on."""
+
+    def test_parents_before_children(self):
+        """Every table's dependencies sit in an earlier level."""
+        level_of = {t: i for i, level in enumerate(snowflake_sync.SYNC_LEVELS)
+                    for t in level}
+        self.assertEqual(set(level_of), set(TABLE_CONFIG))
+        for table, config in TABLE_CONFIG.items():
+            for parent in config['depends_on']:
+                self.assertLess(level_of[parent], level_of[table])
+
+    def test_cycle_raises(self):
+        """A dependency cycle is rejected instead of silently dropped."""
+        cyclic = dict(TABLE_CONFIG['sessions'], depends_on=['tool_calls'])
+        with patch.dict(TABLE_CONFIG, {'sessions': cyclic}):
+            with self.assertRaises(graphlib.CycleError):
+                snowflake_sync._dependency_levels()
+
+
+class TestGetPendingCounts(unittest.TestCase):
+    """Test the --dry-run row counts."""
+
+    def setUp(self):
+        """Create just the columns the count queries read."""
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.executescript("""
+            CREATE TABLE sessions (session_id TEXT, file_mtime REAL);
+            CREATE TABLE daily_summaries (date TEXT);
+            CREATE TABLE snapshots (id INTEGER PRIMARY KEY);
+            CREATE TABLE turns (id INTEGER PRIMARY KEY);
+        """)
+        self.conn.executemany("INSERT INTO sessions VALUES (?, ?)",
+                              [('a', 100.0), ('b', 200.0), ('c', 300.0), ('d', None)])
+        self.conn.executemany("INSERT INTO daily_summaries VALUES (?)",
+                              [('2026-01-01',), ('2026-01-02',)])
+        self.conn.executemany("INSERT INTO snapshots VALUES (?)", [(3,), (9,)])
+        self.conn.executemany("INSERT INTO turns VALUES (?)", [(1,), (50,)])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_upsert_param_binds_to_its_own_query(self):
+        """The sessions watermark binds correctly wherever sessions appears."""
+        states = {
+            'sessions': {'last_synced_id': None, 'last_synced_timestamp': '150.0',
+                         'rows_synced': 0},
+            'snapshots': {'last_synced_id': 4, 'last_synced_timestamp': None,
+                          'rows_synced': 0},
+        }
+        tables = ['daily_summaries', 'snapshots', 'sessions', 'turns']
+        counts = get_pending_counts(self.conn, tables, states)
+
+        self.assertEqual(counts['sessions'][0], 3)  # 200, 300 and NULL mtime
+        self.assertEqual(counts['daily_summaries'][0], 2)
+        self.assertEqual(counts['snapshots'][0], 5)  # MAX(id) 9 - watermark 4
+        self.assertEqual(counts['turns'][0], 50)  # never synced
+
+        reordered = get_pending_counts(self.conn, list(reversed(tables)), states)
+        self.assertEqual(reordered, counts)
+
+    def test_without_state_counts_everything(self):
+        """Tables with no sync state count from the start."""
+        counts = get_pending_counts(self.conn, ['sessions', 'snapshots'], {})
+        self.assertEqual(counts['sessions'][0], 4)
+        self.assertEqual(counts['snapshots'][0], 9)
+
+
+class TestSyncUpsertSessions(unittest.TestCase):
+    """Test the staged load path of the sessions MERGE."""
+
+    def setUp(self):
+        self.sqlite_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.addCleanup(self.sqlite_conn.close)
+        config = TABLE_CONFIG['sessions']
+        self.sqlite_conn.execute(f"CREATE TABLE sessions ({config['col_list']})")
+        mtime = config['col_index']['file_mtime']
+        self.sqlite_conn.execute(
+            f"INSERT INTO sessions VALUES ({config['placeholders']})",
+            [7.0 if i == mtime else 'x' for i in range(len(config['col_names']))],
+        )
+
+    def sync(self, staged, loaded):
+        """Run a COPY sync with stage_rows/copy_staged stubbed; return mocks."""
+        with redirect_stdout(io.StringIO()), \
+                patch.object(snowflake_sync, 'stage_rows', return_value=staged), \
+                patch.object(snowflake_sync, 'copy_staged',
+                             return_value=loaded) as copy_staged, \
+                patch.object(snowflake_sync, 'execute_with_retry'), \
+                patch.object(snowflake_sync, 'update_sync_state') as update_state:
+            rows = snowflake_sync.sync_upsert_sessions(
+                self.sqlite_conn, MagicMock(), dict(snowflake_sync.EMPTY_SYNC_STATE),
+                100, load_method='copy',
+            )
+        return rows, copy_staged, update_state
+
+    def test_nothing_staged_skips_copy(self):
+        """No PUT means no COPY, so stale stage files are never loaded."""
+        rows, copy_staged, update_state = self.sync(staged=0, loaded=99)
+        copy_staged.assert_not_called()
+        self.assertEqual(rows, 0)
+        self.assertEqual(update_state.call_args.kwargs['rows_synced'], 0)
+
+    def test_records_rows_copied(self):
+        """The watermark row records COPY's count, not the staged count."""
+        rows, copy_staged, update_state = self.sync(staged=3, loaded=2)
+        copy_staged.assert_called_once()
+        self.assertEqual(rows, 2)
+        self.assertEqual(update_state.call_args.kwargs['rows_synced'], 2)
+
+
+class TestSyncTables(unittest.TestCase):
+    """Test the sync_tables scheduler with the per-table sync stubbed out."""
+
+    def setUp(self):
+        self.sqlite_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.addCleanup(self.sqlite_conn.close)
+        self.pool = snowflake_sync.ConnectionPool(self.sqlite_conn, object())
+        self.tables = ['sessions', 'daily_summaries']
+
+    def run_sync_tables(self):
+        with redirect_stdout(io.StringIO()):
+            return snowflake_sync.sync_tables(self.pool, self.tables, 100,
+                                              max_workers=1)
+
+    def test_state_read_failure_fails_each_table(self):
+        """A failed watermark read is recorded per table, not raised."""
+        with patch.object(snowflake_sync, 'get_sync_states',
+                          side_effect=RuntimeError("session expired")), \
+                patch.object(snowflake_sync, 'sync_table') as sync_table:
+            total_rows, errors, timings = self.run_sync_tables()
+
+        sync_table.assert_not_called()
+        self.assertEqual((total_rows, timings), (0, {}))
+        self.assertEqual([(e.table, e.message) for e in errors],
+                         [(t, "session expired") for t in self.tables])
+        # The pool got its connection back for the next run
+        self.assertIsNotNone(self.pool.acquire())
+
+    def test_states_passed_to_each_table(self):
+        """Each table syncs with its own watermark from the batched read."""
+        states = {'sessions': dict(snowflake_sync.EMPTY_SYNC_STATE,
+                                   last_synced_timestamp='5.0')}
+        with patch.object(snowflake_sync, 'get_sync_states', return_value=states), \
+                patch.object(snowflake_sync, 'sync_table', return_value=3) as sync_table:
+            total_rows, errors, _ = self.run_sync_tables()
+
+        self.assertEqual((total_rows, errors), (6, []))
+        passed = {c.args[2]: c.args[4] for c in sync_table.call_args_list}
+        self.assertEqual(passed, {'sessions': states['sessions'],
+                                  'daily_summaries': snowflake_sync.EMPTY_SYNC_STATE})
+
+
+class TestRunSync(unittest.TestCase):
+    """Test one --watch pass of run_sync."""
+
+    def setUp(self):
+        self.sqlite_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.addCleanup(self.sqlite_conn.close)
+        self.pool = snowflake_sync.ConnectionPool(self.sqlite_conn, object())
+        self.args = snowflake_sync.create_parser().parse_args(
+            ['--watch', '60', '--tables', 'sessions']
+        )
+
+    def run_pass(self, run_count):
+        with redirect_stdout(io.StringIO()):
+            return snowflake_sync.run_sync(self.args, self.pool, self.sqlite_conn,
+                                           None, ['sessions'], run_count)
+
+    def test_failed_pass_is_retried_by_the_next(self):
+        """A transient failure fails one pass cleanly; the next pass syncs."""
+        state_reads = [RuntimeError("connection reset"), {}]
+        with patch.object(snowflake_sync, 'get_sync_states',
+                          side_effect=state_reads), \
+                patch.object(snowflake_sync, 'sync_table', return_value=1) as sync_table:
+            errors = self.run_pass(1)
+            self.assertEqual([(e.table, e.message) for e in errors],
+                             [('sessions', "connection reset")])
+            sync_table.assert_not_called()
+
+            self.assertEqual(self.run_pass(2), [])
+            sync_table.assert_called_once()
+
+    def test_unexpected_error_fails_the_pass(self):
+        """Anything sync_tables raises is recorded rather than ending --watch."""
+        with patch.object(snowflake_sync, 'sync_tables',
+                          side_effect=OSError("disk full")):
+            errors = self.run_pass(1)
+        self.assertEqual([(e.table, e.message) for e in errors], [('sync', "disk full")])
+
+
+class TestLoadDotenv(unittest.TestCase):
+    """Test .env parsing."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env_path = Path(self.temp_dir) / '.env'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def load(self, text, environ=None):
+        """Parse text as a .env file into a copy of environ; return the copy."""
+        self.env_path.write_bytes(text.encode('utf-8'))
+        with patch.dict(os.environ, environ or {}, clear=True):
+            load_dotenv(self.env_path)
+            return dict(os.environ)
+
+    def test_parses_keys_values_and_quotes(self):
+        """Whitespace around '=' and matching quotes are stripped."""
+        env = self.load(
+            "SNOWFLAKE_ACCOUNT=abc123\n"
+            "  SNOWFLAKE_USER = loader  \n"
+            "SNOWFLAKE_ROLE=\"SYS ADMIN\"\n"
+            "SNOWFLAKE_SCHEMA='raw'\n"
+            "SNOWFLAKE_WAREHOUSE=\"unbalanced'\n"
+        )
+        self.assertEqual(env, {
+            'SNOWFLAKE_ACCOUNT': 'abc123',
+            'SNOWFLAKE_USER': 'loader',
+            'SNOWFLAKE_ROLE': 'SYS ADMIN',
+            'SNOWFLAKE_SCHEMA': 'raw',
+            'SNOWFLAKE_WAREHOUSE': "\"unbalanced'",
+        })
+
+    def test_skips_comments_and_blank_lines(self):
+        """Comment, blank and '='-less lines set nothing."""
+        env = self.load("# SNOWFLAKE_USER=nobody\n\n   \nnot a setting\nA=1\n")
+        self.assertEqual(env, {'A': '1'})
+
+    def test_crlf_and_empty_values(self):
+        """Windows line endings don't leak into values; empty values are kept."""
+        env = self.load("A=1\r\nB=\r\nC=x=y\r\n")
+        self.assertEqual(env, {'A': '1', 'B': '', 'C': 'x=y'})
+
+    def test_existing_variables_win(self):
+        """Variables already in the environment are not overwritten."""
+        env = self.load("A=from-file\nB=from-file\n", {'A': 'from-env'})
+        self.assertEqual(env, {'A': 'from-env', 'B': 'from-file'})
+
+    def test_missing_file_is_ignored(self):
+        """A missing .env is not an error."""
+        with patch.dict(os.environ, {}, clear=True):
+            load_dotenv(Path(self.temp_dir) / 'missing.env')
+            self.assertEqual(dict(os.environ), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,17 +9,23 @@ Usage:
     python scripts/git_report.py --repo /path/to/repo
     python scripts/git_report.py --output my_report.md
     python scripts/git_report.py --top-n 30
+    python scripts/git_report.py --sections overview,churn,growth
 """
 
 import argparse
+import functools
+import io
+import itertools
 import os
 import re
 import subprocess
 import sys
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Collection, Iterable, Iterator, Sequence, TextIO
 
 # ──────────────────────────────────────────────────────────────────────
 # Constants
@@ -46,6 +52,22 @@ CONVENTIONAL_TYPES = [
     "test", "build", "ci", "chore", "revert",
 ]
 
+# Pre-built rank labels for numbered table rows (see _ranks)
+_RANK_STRS = tuple(str(i) for i in range(1, 1001))
+
+# Report section key -> table-of-contents entry, in report order
+REPORT_SECTIONS = {
+    "overview": "1. [Repository Overview](#1-repository-overview)",
+    "contributors": "2. [Contributor Statistics](#2-contributor-statistics)",
+    "activity": "3. [Commit Activity Patterns](#3-commit-activity-patterns)",
+    "code": "4. [Code Statistics](#4-code-statistics)",
+    "churn": "5. [Code Churn Analysis](#5-code-churn-analysis)",
+    "messages": "6. [Commit Message Analysis](#6-commit-message-analysis)",
+    "branches": "7. [Branches & Tags](#7-branches--tags)",
+    "recent": "8. [Recent Activity](#8-recent-activity)",
+    "growth": "9. [Repository Growth](#9-repository-growth)",
+}
+
 DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 DAY_SHORT = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
@@ -89,8 +111,13 @@ def get_git_root(path: Path) -> Path:
 # Formatting helpers
 # ──────────────────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=4096, typed=True)
 def fmt_number(n: int | float) -> str:
-    """Format number with thousands separator."""
+    """Format number with thousands separator.
+
+    Cached: table rows repeat the same small counts over and over.
+    typed=True keeps 1 and 1.0 (which format differently) apart.
+    """
     if isinstance(n, float):
         return f"{n:,.1f}"
     return f"{n:,}"
@@ -111,6 +138,7 @@ def fmt_duration(days: int) -> str:
     return f"{years:.1f} years"
 
 
+@functools.lru_cache(maxsize=4096)
 def fmt_pct(part: int | float, total: int | float) -> str:
     """Format a percentage."""
     if total == 0:
@@ -118,6 +146,16 @@ def fmt_pct(part: int | float, total: int | float) -> str:
     return f"{100.0 * part / total:.1f}%"
 
 
+def _ranks() -> Iterator[str]:
+    """Yield 1-based rank labels ("1", "2", ...), reusing cached strings."""
+    return itertools.chain(_RANK_STRS, map(str, itertools.count(len(_RANK_STRS) + 1)))
+
+
+def _truncate(s: str, n: int) -> str:
+    """Shorten s to n characters plus an ellipsis if it is longer."""
+    return s if len(s) <= n else s[:n] + "..."
+
+
 def fmt_bar_chart(
     data: dict[str, int],
     width: int = 40,
@@ -131,32 +169,48 @@ def fmt_bar_chart(
         Label1  │████████████████ 145
         Label2  │█████████ 78
     """
+    buf = io.StringIO()
+    fmt_bar_chart_into(buf, data, width, title, sort_by_value, max_label_len)
+    return buf.getvalue()
+
+
+def fmt_bar_chart_into(
+    out: TextIO,
+    data: dict[str, int],
+    width: int = 40,
+    title: str = "",
+    sort_by_value: bool = False,
+    max_label_len: int = 0,
+) -> None:
+    """Write a horizontal Unicode bar chart (see fmt_bar_chart) to ``out``."""
     if not data:
-        return "  (no data)\n"
+        out.write("  (no data)\n")
+        return
 
-    items = list(data.items())
+    items: Iterable[tuple[str, int]] = data.items()
     if sort_by_value:
-        items.sort(key=lambda x: x[1], reverse=True)
+        items = sorted(items, key=lambda x: x[1], reverse=True)
 
-    max_val = max(v for _, v in items) if items else 1
+    max_val = max(data.values())
     if max_label_len == 0:
-        max_label_len = max(len(str(k)) for k, _ in items)
+        max_label_len = max(len(str(k)) for k in data)
 
-    lines = []
+    w = out.write
     if title:
-        lines.append(f"  {title}")
-        lines.append("  " + "─" * (max_label_len + width + 12))
+        w(f"  {title}\n")
+        w("  " + "─" * (max_label_len + width + 12) + "\n")
 
     for label, value in items:
         bar_len = int(width * value / max_val) if max_val > 0 else 0
         bar = BAR_FULL * bar_len
-        lines.append(f"  {str(label):<{max_label_len}} │{bar} {fmt_number(value)}")
+        w(f"  {str(label):<{max_label_len}} │{bar} {fmt_number(value)}\n")
 
-    return "\n".join(lines) + "\n"
 
+def fmt_sparkline(values: Collection[int | float]) -> str:
+    """Create an inline sparkline string.
 
-def fmt_sparkline(values: list[int | float]) -> str:
-    """Create an inline sparkline string."""
+    values may be any re-iterable collection, e.g. ``dict.values()``.
+    """
     if not values:
         return ""
     lo = min(values)
@@ -167,30 +221,45 @@ def fmt_sparkline(values: list[int | float]) -> str:
     return "".join(chars[min(n, int((v - lo) / rng * n))] for v in values)
 
 
-def fmt_table(headers: list[str], rows: list[list[str]], align: list[str] | None = None) -> str:
+_JUSTIFY = {"r": str.rjust, "c": str.center}
+
+
+def fmt_table(headers: list[str], rows: Iterable[Sequence[str]], align: list[str] | None = None) -> str:
     """Create a Markdown table.
 
     align: list of 'l', 'r', or 'c' per column.
     """
+    buf = io.StringIO()
+    fmt_table_into(buf, headers, rows, align)
+    return buf.getvalue().rstrip("\n")
+
+
+def fmt_table_into(
+    out: TextIO,
+    headers: list[str],
+    rows: Iterable[Sequence[str]],
+    align: list[str] | None = None,
+) -> None:
+    """Write a Markdown table (newline-terminated) to ``out``.
+
+    rows may be any iterable of row tuples, e.g. a generator; it is
+    materialized once here because column widths need every cell.
+    """
+    rows = list(rows)
     if not rows:
-        return "| " + " | ".join(headers) + " |\n" + "| " + " | ".join("---" for _ in headers) + " |\n| (no data) |"
+        out.write("| " + " | ".join(headers) + " |\n" + "| " + " | ".join("---" for _ in headers) + " |\n| (no data) |\n")
+        return
 
+    ncols = len(headers)
     if align is None:
-        align = ["l"] * len(headers)
+        align = ["l"] * ncols
 
-    # Compute column widths
+    # Compute column widths in one pass; zip() drops any extra cells
     widths = [len(h) for h in headers]
     for row in rows:
-        for i, cell in enumerate(row):
-            if i < len(widths):
-                widths[i] = max(widths[i], len(str(cell)))
-
-    def pad(val: str, w: int, a: str) -> str:
-        if a == "r":
-            return str(val).rjust(w)
-        if a == "c":
-            return str(val).center(w)
-        return str(val).ljust(w)
+        for i, n in zip(range(ncols), map(len, row)):
+            if n > widths[i]:
+                widths[i] = n
 
     def sep(w: int, a: str) -> str:
         if a == "r":
@@ -199,17 +268,13 @@ def fmt_table(headers: list[str], rows: list[list[str]], align: list[str] | None
             return ":" + "-" * (w - 2) + ":"
         return "-" * w
 
-    header_line = "| " + " | ".join(pad(h, widths[i], align[i]) for i, h in enumerate(headers)) + " |"
-    sep_line = "| " + " | ".join(sep(max(widths[i], 3), align[i]) for i in range(len(headers))) + " |"
-    body_lines = []
+    justs = [_JUSTIFY.get(a, str.ljust) for a in align]
+    out.write("| " + " | ".join([j(h, w) for j, h, w in zip(justs, headers, widths)]) + " |\n")
+    out.write("| " + " | ".join([sep(max(w, 3), a) for w, a in zip(widths, align)]) + " |\n")
     for row in rows:
-        cells = []
-        for i in range(len(headers)):
-            val = row[i] if i < len(row) else ""
-            cells.append(pad(str(val), widths[i], align[i]))
-        body_lines.append("| " + " | ".join(cells) + " |")
-
-    return "\n".join([header_line, sep_line] + body_lines)
+        if len(row) < ncols:
+            row = (*row, *[""] * (ncols - len(row)))
+        out.write("| " + " | ".join([j(c, w) for j, c, w in zip(justs, row, widths)]) + " |\n")
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -519,6 +584,7 @@ def collect_churn(commits: list[dict], top_n: int = 20) -> dict[str, Any]:
         "hotspots": hotspots,
         "file_added": file_added,
         "file_deleted": file_deleted,
+        "file_churn": file_churn,
         "file_commit_count": file_commit_count,
     }
 
@@ -665,78 +731,93 @@ def collect_growth(commits: list[dict]) -> dict[str, Any]:
 # ──────────────────────────────────────────────────────────────────────
 
 class GitReportGenerator:
-    """Orchestrates all sections into a Markdown report."""
+    """Orchestrates all sections into a Markdown report.
 
-    def __init__(self, repo: Path, top_n: int = 20):
+    Sections are written straight to a single text stream (a file or an
+    ``io.StringIO``) in a single pass. Every line is newline-terminated
+    and generate_to() writes the blank line between sections, so no
+    per-section line lists or joins are needed and the full report never
+    has to be held in memory.
+    """
+
+    def __init__(self, repo: Path, top_n: int = 20, sections: Iterable[str] | None = None):
         self.repo = repo
         self.top_n = top_n
+        self.sections = [s for s in REPORT_SECTIONS if sections is None or s in sections]
         self.repo_name = repo.name
-        self.sections: list[str] = []
+        self._out: TextIO | None = None
         self.generated_at = datetime.now()
+        self._t0 = time.monotonic()
 
     def generate(self) -> str:
-        """Run all collectors and assemble the report."""
+        """Run all collectors and return the report as a string."""
+        buf = io.StringIO()
+        self.generate_to(buf)
+        return buf.getvalue()
+
+    def generate_to(self, out: TextIO) -> None:
+        """Run all collectors and write the report to ``out``."""
+        self._out = out
         print("  Parsing git log...", flush=True)
         commits = parse_full_log(self.repo)
 
         if not commits:
-            return self._empty_report()
+            out.write(self._empty_report())
+            return
 
-        print(f"  Found {len(commits)} commits. Collecting statistics...", flush=True)
+        print(f"  Found {len(commits)} commits. Building report...", flush=True)
+        # The header needs the overview, so it is always collected
         overview = collect_overview(commits, self.repo)
-        contributors = collect_contributors(commits)
-        activity = collect_activity(commits)
-        print("  Analyzing code...", flush=True)
-        code_stats = collect_code_stats(self.repo)
-        churn = collect_churn(commits, self.top_n)
-        messages = collect_messages(commits)
-        bt = collect_branches_tags(self.repo)
-        recent = collect_recent(commits)
-        growth = collect_growth(commits)
-
-        print("  Building report...", flush=True)
+
+        # Section key -> (builder, collector returning the builder's args).
+        # Collectors run only for requested sections, so e.g. skipping
+        # "code" avoids reading every tracked file at HEAD. They run in a
+        # thread pool because most of their time is spent waiting on git
+        # subprocesses; formatting stays sequential, in report order.
+        dispatch = {
+            "overview": (self._add_overview, lambda: (overview,)),
+            "contributors": (self._add_contributors, lambda: (collect_contributors(commits), overview)),
+            "activity": (self._add_activity, lambda: (collect_activity(commits), overview)),
+            "code": (self._add_code_stats, lambda: (collect_code_stats(self.repo),)),
+            "churn": (self._add_churn, lambda: (collect_churn(commits, self.top_n),)),
+            "messages": (self._add_messages, lambda: (collect_messages(commits),)),
+            "branches": (self._add_branches_tags, lambda: (collect_branches_tags(self.repo), overview)),
+            "recent": (self._add_recent, lambda: (collect_recent(commits),)),
+            "growth": (self._add_growth, lambda: (collect_growth(commits),)),
+        }
+
         self._add_header(overview)
+        out.write("\n")
         self._add_toc()
-        self._add_overview(overview)
-        self._add_contributors(contributors, overview)
-        self._add_activity(activity, overview)
-        self._add_code_stats(code_stats)
-        self._add_churn(churn)
-        self._add_messages(messages)
-        self._add_branches_tags(bt, overview)
-        self._add_recent(recent)
-        self._add_growth(growth)
+        out.write("\n")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pending = [(name, pool.submit(dispatch[name][1])) for name in self.sections]
+            for name, future in pending:
+                print(f"  Section: {name}", flush=True)
+                add_section = dispatch[name][0]
+                add_section(*future.result())
+                out.write("\n")
         self._add_footer()
 
-        return "\n\n".join(self.sections)
-
     # ── Header ────────────────────────────────────────────────────────
 
     def _add_header(self, overview: dict) -> None:
         repo_root = get_git_root(self.repo)
-        self.sections.append(
+        self._out.write(
             f"# Git Repository Statistics Report\n\n"
             f"**Repository**: `{self.repo_name}`  \n"
             f"**Path**: `{repo_root}`  \n"
             f"**Generated**: {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}  \n"
             f"**Commits analyzed**: {fmt_number(overview['total_commits'])}  \n"
             f"**Branch**: `{overview['current_branch']}`\n\n"
-            f"---"
+            f"---\n"
         )
 
     def _add_toc(self) -> None:
-        self.sections.append(
-            "## Table of Contents\n\n"
-            "1. [Repository Overview](#1-repository-overview)\n"
-            "2. [Contributor Statistics](#2-contributor-statistics)\n"
-            "3. [Commit Activity Patterns](#3-commit-activity-patterns)\n"
-            "4. [Code Statistics](#4-code-statistics)\n"
-            "5. [Code Churn Analysis](#5-code-churn-analysis)\n"
-            "6. [Commit Message Analysis](#6-commit-message-analysis)\n"
-            "7. [Branches & Tags](#7-branches--tags)\n"
-            "8. [Recent Activity](#8-recent-activity)\n"
-            "9. [Repository Growth](#9-repository-growth)"
-        )
+        w = self._out.write
+        w("## Table of Contents\n\n")
+        for name in self.sections:
+            w(f"{REPORT_SECTIONS[name]}\n")
 
     # ── Section 1: Overview ───────────────────────────────────────────
 
@@ -757,30 +838,31 @@ class GitReportGenerator:
             ["Avg Commits/Day", f"{ov['commits_per_day']:.1f}"],
         ]
 
-        table = fmt_table(["Metric", "Value"], rows, ["l", "r"])
-        self.sections.append(f"## 1. Repository Overview\n\n{table}")
+        self._out.write("## 1. Repository Overview\n\n")
+        fmt_table_into(self._out, ["Metric", "Value"], rows, ["l", "r"])
 
     # ── Section 2: Contributors ───────────────────────────────────────
 
     def _add_contributors(self, contribs: list[dict], overview: dict) -> None:
-        lines = ["## 2. Contributor Statistics"]
+        w = self._out.write
+        w("## 2. Contributor Statistics\n")
 
         # Summary
         total_commits = overview["total_commits"]
-        lines.append(f"\n**{len(contribs)}** contributor(s) — "
-                      f"**{fmt_number(total_commits)}** total commits\n")
+        w(f"\n**{len(contribs)}** contributor(s) — "
+          f"**{fmt_number(total_commits)}** total commits\n\n")
 
         # Table
         headers = ["#", "Contributor", "Commits", "%", "Lines ++", "Lines --", "Net", "First Active", "Last Active"]
         align = ["r", "l", "r", "r", "r", "r", "r", "c", "c"]
         rows = []
-        for i, c in enumerate(contribs[:self.top_n], 1):
+        for rank, c in zip(_ranks(), contribs[:self.top_n]):
             net = c["lines_added"] - c["lines_deleted"]
             net_str = f"+{fmt_number(net)}" if net >= 0 else fmt_number(net)
             first = c["first_date"].strftime("%Y-%m-%d") if c["first_date"] else "?"
             last = c["last_date"].strftime("%Y-%m-%d") if c["last_date"] else "?"
             rows.append([
-                str(i),
+                rank,
                 c["name"],
                 fmt_number(c["commits"]),
                 fmt_pct(c["commits"], total_commits),
@@ -791,55 +873,54 @@ class GitReportGenerator:
                 last,
             ])
 
-        lines.append(fmt_table(headers, rows, align))
+        fmt_table_into(self._out, headers, rows, align)
 
         # Bar chart
         if contribs:
             chart_data = {c["name"]: c["commits"] for c in contribs[:15]}
-            lines.append("\n### Commit Distribution\n")
-            lines.append("```")
-            lines.append(fmt_bar_chart(chart_data, width=40, title="Commits per Contributor"))
-            lines.append("```")
-
-        self.sections.append("\n".join(lines))
+            w("\n### Commit Distribution\n\n")
+            w("```\n")
+            fmt_bar_chart_into(self._out, chart_data, width=40, title="Commits per Contributor")
+            w("\n```\n")
 
     # ── Section 3: Activity ───────────────────────────────────────────
 
     def _add_activity(self, act: dict, overview: dict) -> None:
-        lines = ["## 3. Commit Activity Patterns"]
+        w = self._out.write
+        w("## 3. Commit Activity Patterns\n")
 
         # Day of week
-        lines.append("\n### By Day of Week\n")
+        w("\n### By Day of Week\n\n")
         dow_ordered = {d: act["by_day_of_week"].get(d, 0) for d in DAY_ORDER}
-        lines.append("```")
-        lines.append(fmt_bar_chart(dow_ordered, width=35, title="Commits by Day"))
-        lines.append("```")
+        w("```\n")
+        fmt_bar_chart_into(self._out, dow_ordered, width=35, title="Commits by Day")
+        w("\n```\n")
 
         # Hour of day
-        lines.append("\n### By Hour of Day\n")
+        w("\n### By Hour of Day\n\n")
         hour_data = {f"{h:02d}:00": act["by_hour"].get(h, 0) for h in range(24)}
-        lines.append("```")
-        lines.append(fmt_bar_chart(hour_data, width=35, title="Commits by Hour (local time)"))
-        lines.append("```")
+        w("```\n")
+        fmt_bar_chart_into(self._out, hour_data, width=35, title="Commits by Hour (local time)")
+        w("\n```\n")
 
         # Sparkline for hour
         hour_vals = [act["by_hour"].get(h, 0) for h in range(24)]
         if any(hour_vals):
-            lines.append(f"\n**Hourly sparkline**: `{fmt_sparkline(hour_vals)}`\n")
+            w(f"\n**Hourly sparkline**: `{fmt_sparkline(hour_vals)}`\n\n")
 
         # By month
         if act["by_month"]:
-            lines.append("\n### By Month\n")
-            lines.append("```")
-            lines.append(fmt_bar_chart(act["by_month"], width=35, title="Commits by Month"))
-            lines.append("```")
+            w("\n### By Month\n\n")
+            w("```\n")
+            fmt_bar_chart_into(self._out, act["by_month"], width=35, title="Commits by Month")
+            w("\n```\n")
 
-            month_vals = list(act["by_month"].values())
+            month_vals = act["by_month"].values()
             if len(month_vals) > 1:
-                lines.append(f"\n**Monthly trend**: `{fmt_sparkline(month_vals)}`\n")
+                w(f"\n**Monthly trend**: `{fmt_sparkline(month_vals)}`\n\n")
 
         # Streaks
-        lines.append("\n### Streaks & Consistency\n")
+        w("\n### Streaks & Consistency\n\n")
         total = overview["total_commits"]
         rows = [
             ["Unique Active Days", fmt_number(act["unique_active_days"])],
@@ -850,108 +931,102 @@ class GitReportGenerator:
             active_pct = 100.0 * act["unique_active_days"] / overview["age_days"]
             rows.append(["Active Day Rate", f"{active_pct:.1f}%"])
 
-        lines.append(fmt_table(["Metric", "Value"], rows, ["l", "r"]))
-
-        self.sections.append("\n".join(lines))
+        fmt_table_into(self._out, ["Metric", "Value"], rows, ["l", "r"])
 
     # ── Section 4: Code Stats ─────────────────────────────────────────
 
     def _add_code_stats(self, cs: dict) -> None:
-        lines = [
-            "## 4. Code Statistics",
-            f"\n**{fmt_number(cs['total_files'])}** tracked files — "
-            f"**{fmt_number(cs['total_lines'])}** total lines\n",
-        ]
+        w = self._out.write
+        w("## 4. Code Statistics\n")
+        w(f"\n**{fmt_number(cs['total_files'])}** tracked files — "
+          f"**{fmt_number(cs['total_lines'])}** total lines\n\n")
 
         # By extension table
         if cs["by_extension"]:
             headers = ["Extension", "Files", "Lines", "% of Lines"]
             align = ["l", "r", "r", "r"]
-            rows = []
             total_l = cs["total_lines"] or 1
-            for ext in list(cs["lines_by_extension"].keys())[:20]:
-                rows.append([
+            by_ext = cs["by_extension"]
+            lines_by_ext = cs["lines_by_extension"]
+            rows = (
+                (
                     ext,
-                    fmt_number(cs["by_extension"].get(ext, 0)),
-                    fmt_number(cs["lines_by_extension"].get(ext, 0)),
-                    fmt_pct(cs["lines_by_extension"].get(ext, 0), total_l),
-                ])
-            lines.append("### Files by Type\n")
-            lines.append(fmt_table(headers, rows, align))
+                    fmt_number(by_ext.get(ext, 0)),
+                    fmt_number(lines_by_ext.get(ext, 0)),
+                    fmt_pct(lines_by_ext.get(ext, 0), total_l),
+                )
+                for ext in itertools.islice(lines_by_ext, 20)
+            )
+            w("### Files by Type\n\n")
+            fmt_table_into(self._out, headers, rows, align)
 
         # Largest files
         if cs["largest_files"]:
-            lines.append("\n### Largest Files (by line count)\n")
+            w("\n### Largest Files (by line count)\n\n")
             headers = ["#", "File", "Lines"]
             align = ["r", "l", "r"]
-            rows = []
-            for i, (fpath, n) in enumerate(cs["largest_files"][:15], 1):
-                rows.append([str(i), f"`{fpath}`", fmt_number(n)])
-            lines.append(fmt_table(headers, rows, align))
-
-        self.sections.append("\n".join(lines))
+            rows = (
+                (rank, f"`{fpath}`", fmt_number(n))
+                for rank, (fpath, n) in zip(_ranks(), itertools.islice(cs["largest_files"], 15))
+            )
+            fmt_table_into(self._out, headers, rows, align)
 
     # ── Section 5: Churn ──────────────────────────────────────────────
 
     def _add_churn(self, churn: dict) -> None:
-        lines = ["## 5. Code Churn Analysis"]
+        w = self._out.write
+        w("## 5. Code Churn Analysis\n")
 
         if not churn["most_modified"]:
-            lines.append("\n*Not enough history for churn analysis.*")
-            self.sections.append("\n".join(lines))
+            w("\n*Not enough history for churn analysis.*\n")
             return
 
+        # Bound .get methods keep the per-row lookups to a single call
+        fa_get = churn["file_added"].get
+        fd_get = churn["file_deleted"].get
+        fcc_get = churn["file_commit_count"].get
+        churn_get = churn["file_churn"].get
+
+        def added_deleted_rows(ranked: list[tuple[str, int]]) -> Iterator[tuple[str, ...]]:
+            """Rows of (rank, path, value, +added, -deleted) for a ranked file list."""
+            for rank, (path, value) in zip(_ranks(), ranked[:self.top_n]):
+                yield (rank, f"`{path}`", fmt_number(value),
+                       "+" + fmt_number(fa_get(path, 0)), "-" + fmt_number(fd_get(path, 0)))
+
+        align = ["r", "l", "r", "r", "r"]
+
         # Most modified
-        lines.append("\n### Most Frequently Modified Files\n")
+        w("\n### Most Frequently Modified Files\n\n")
         headers = ["#", "File", "Commits", "Lines ++", "Lines --"]
-        align = ["r", "l", "r", "r", "r"]
-        rows = []
-        for i, (path, count) in enumerate(churn["most_modified"][:self.top_n], 1):
-            added = churn["file_added"].get(path, 0)
-            deleted = churn["file_deleted"].get(path, 0)
-            rows.append([str(i), f"`{path}`", fmt_number(count),
-                         f"+{fmt_number(added)}", f"-{fmt_number(deleted)}"])
-        lines.append(fmt_table(headers, rows, align))
+        fmt_table_into(self._out, headers, added_deleted_rows(churn["most_modified"]), align)
 
         # Highest churn
-        lines.append("\n### Highest Churn (lines added + deleted)\n")
+        w("\n### Highest Churn (lines added + deleted)\n\n")
         headers = ["#", "File", "Total Churn", "Added", "Deleted"]
-        align = ["r", "l", "r", "r", "r"]
-        rows = []
-        for i, (path, total) in enumerate(churn["highest_churn"][:self.top_n], 1):
-            added = churn["file_added"].get(path, 0)
-            deleted = churn["file_deleted"].get(path, 0)
-            rows.append([str(i), f"`{path}`", fmt_number(total),
-                         f"+{fmt_number(added)}", f"-{fmt_number(deleted)}"])
-        lines.append(fmt_table(headers, rows, align))
+        fmt_table_into(self._out, headers, added_deleted_rows(churn["highest_churn"]), align)
 
         # Hotspots
         has_hotspots = any(score > 0 for _, score in churn["hotspots"])
         if has_hotspots:
-            lines.append("\n### Hotspots (frequency x churn)\n")
-            lines.append("*High scores indicate files that change often AND have large diffs — likely candidates for refactoring.*\n")
-            # Use full commit count data
-            mod_lookup = churn["file_commit_count"]
+            w("\n### Hotspots (frequency x churn)\n\n")
+            w("*High scores indicate files that change often AND have large diffs — likely candidates for refactoring.*\n\n")
             headers = ["#", "File", "Score", "Commits", "Churn"]
-            align = ["r", "l", "r", "r", "r"]
-            rows = []
-            for i, (path, score) in enumerate(churn["hotspots"][:self.top_n], 1):
-                cc = mod_lookup.get(path, 0)
-                ch = churn["file_added"].get(path, 0) + churn["file_deleted"].get(path, 0)
-                rows.append([str(i), f"`{path}`", fmt_number(score),
-                             fmt_number(cc), fmt_number(ch)])
-            lines.append(fmt_table(headers, rows, align))
-
-        self.sections.append("\n".join(lines))
+            rows = (
+                (rank, f"`{path}`", fmt_number(score),
+                 fmt_number(fcc_get(path, 0)),
+                 fmt_number(churn_get(path, 0)))
+                for rank, (path, score) in zip(_ranks(), churn["hotspots"][:self.top_n])
+            )
+            fmt_table_into(self._out, headers, rows, align)
 
     # ── Section 6: Messages ───────────────────────────────────────────
 
     def _add_messages(self, msg: dict) -> None:
-        lines = ["## 6. Commit Message Analysis"]
+        w = self._out.write
+        w("## 6. Commit Message Analysis\n")
 
         if msg["total"] == 0:
-            lines.append("\n*No commit messages to analyze.*")
-            self.sections.append("\n".join(lines))
+            w("\n*No commit messages to analyze.*\n")
             return
 
         # Summary
@@ -961,150 +1036,144 @@ class GitReportGenerator:
             ["Shortest Message", f"{msg['min_length']} chars"],
             ["Longest Message", f"{msg['max_length']} chars"],
         ]
-        lines.append("")
-        lines.append(fmt_table(["Metric", "Value"], rows, ["l", "r"]))
+        w("\n")
+        fmt_table_into(self._out, ["Metric", "Value"], rows, ["l", "r"])
 
         # Length distribution
         if msg["length_dist"]:
-            lines.append("\n### Message Length Distribution\n")
-            lines.append("```")
-            lines.append(fmt_bar_chart(msg["length_dist"], width=30, title="Message Lengths"))
-            lines.append("```")
+            w("\n### Message Length Distribution\n\n")
+            w("```\n")
+            fmt_bar_chart_into(self._out, msg["length_dist"], width=30, title="Message Lengths")
+            w("\n```\n")
 
         # Conventional commits
         if msg["conventional"]:
-            lines.append("\n### Conventional Commit Types\n")
-            total_conv = sum(msg["conventional"].values())
+            w("\n### Conventional Commit Types\n\n")
+            conv = msg["conventional"]
+            total_conv = sum(conv.values())
             headers = ["Type", "Count", "% of Conventional"]
             align = ["l", "r", "r"]
-            rows = []
-            for t in CONVENTIONAL_TYPES:
-                if t in msg["conventional"]:
-                    rows.append([t, fmt_number(msg["conventional"][t]),
-                                 fmt_pct(msg["conventional"][t], total_conv)])
-            lines.append(fmt_table(headers, rows, align))
-            lines.append(f"\n*{total_conv} conventional commits "
-                         f"({fmt_pct(total_conv, msg['total'])} of total), "
-                         f"{msg['conventional_other']} non-conventional.*")
+            # collect_messages() keeps the counts in CONVENTIONAL_TYPES order
+            rows = ((t, fmt_number(n), fmt_pct(n, total_conv)) for t, n in conv.items())
+            fmt_table_into(self._out, headers, rows, align)
+            w(f"\n*{total_conv} conventional commits "
+              f"({fmt_pct(total_conv, msg['total'])} of total), "
+              f"{msg['conventional_other']} non-conventional.*\n")
         else:
             conv_pct = fmt_pct(0, msg["total"])
-            lines.append(f"\n*No conventional commit prefixes detected ({conv_pct} usage).*")
+            w(f"\n*No conventional commit prefixes detected ({conv_pct} usage).*\n")
 
         # Common words
         if msg["common_words"]:
-            lines.append("\n### Most Common Words in Commit Messages\n")
+            w("\n### Most Common Words in Commit Messages\n\n")
             headers = ["Word", "Occurrences"]
             align = ["l", "r"]
-            rows = [[w, fmt_number(c)] for w, c in msg["common_words"]]
-            lines.append(fmt_table(headers, rows, align))
-
-        self.sections.append("\n".join(lines))
+            rows = ((word, fmt_number(c)) for word, c in msg["common_words"])
+            fmt_table_into(self._out, headers, rows, align)
 
     # ── Section 7: Branches & Tags ────────────────────────────────────
 
     def _add_branches_tags(self, bt: dict, overview: dict) -> None:
-        lines = ["## 7. Branches & Tags"]
+        w = self._out.write
+        w("## 7. Branches & Tags\n")
 
         # Branches
         if bt["branches"]:
-            lines.append(f"\n### Branches ({len(bt['branches'])})\n")
+            w(f"\n### Branches ({len(bt['branches'])})\n\n")
             headers = ["Branch", "Last Commit", "Author", "Last Message"]
             align = ["l", "c", "l", "l"]
-            rows = []
-            for b in bt["branches"]:
-                name = b["name"]
-                if name == overview["current_branch"]:
-                    name = f"**{name}** (current)"
-                subj = b["subject"][:60] + "..." if len(b["subject"]) > 60 else b["subject"]
-                rows.append([name, b["date"], b["author"], subj])
-            lines.append(fmt_table(headers, rows, align))
+            current = overview["current_branch"]
+
+            def branch_rows() -> Iterator[tuple[str, ...]]:
+                for b in bt["branches"]:
+                    name = b["name"]
+                    if name == current:
+                        name = f"**{name}** (current)"
+                    yield (name, b["date"], b["author"], _truncate(b["subject"], 60))
+
+            fmt_table_into(self._out, headers, branch_rows(), align)
         else:
-            lines.append("\n*No local branches found.*")
+            w("\n*No local branches found.*\n")
 
         # Tags
         if bt["tags"]:
-            lines.append(f"\n### Tags ({len(bt['tags'])})\n")
+            w(f"\n### Tags ({len(bt['tags'])})\n\n")
             headers = ["Tag", "Date", "Message"]
             align = ["l", "c", "l"]
-            rows = []
-            for t in bt["tags"]:
-                subj = t["subject"][:60] + "..." if len(t["subject"]) > 60 else t["subject"]
-                rows.append([t["name"], t["date"], subj])
-            lines.append(fmt_table(headers, rows, align))
+            rows = (
+                (t["name"], t["date"], _truncate(t["subject"], 60))
+                for t in bt["tags"]
+            )
+            fmt_table_into(self._out, headers, rows, align)
         else:
-            lines.append("\n*No tags found.*")
-
-        self.sections.append("\n".join(lines))
+            w("\n*No tags found.*\n")
 
     # ── Section 8: Recent Activity ────────────────────────────────────
 
     def _add_recent(self, recent: dict) -> None:
-        lines = ["## 8. Recent Activity"]
+        w = self._out.write
+        w("## 8. Recent Activity\n")
 
         commits = recent["recent_commits"]
         if commits:
-            lines.append(f"\n### Last {len(commits)} Commits\n")
+            w(f"\n### Last {len(commits)} Commits\n\n")
             headers = ["Hash", "Author", "When", "Message"]
             align = ["l", "l", "l", "l"]
-            rows = []
-            for c in commits:
-                subj = c["subject"][:65] + "..." if len(c["subject"]) > 65 else c["subject"]
-                rows.append([
+            rows = (
+                (
                     f"`{c['hash'][:8]}`",
                     c["author_name"],
                     c["date_relative"],
-                    subj,
-                ])
-            lines.append(fmt_table(headers, rows, align))
+                    _truncate(c["subject"], 65),
+                )
+                for c in commits
+            )
+            fmt_table_into(self._out, headers, rows, align)
 
         files = recent["recent_files"]
         if files:
-            lines.append(f"\n### Recently Modified Files ({len(files)})\n")
+            w(f"\n### Recently Modified Files ({len(files)})\n\n")
             for f in files:
-                lines.append(f"- `{f}`")
-
-        self.sections.append("\n".join(lines))
+                w(f"- `{f}`\n")
 
     # ── Section 9: Growth ─────────────────────────────────────────────
 
     def _add_growth(self, growth: dict) -> None:
-        lines = ["## 9. Repository Growth"]
+        w = self._out.write
+        w("## 9. Repository Growth\n")
 
         monthly = growth["monthly_commits"]
         cumulative = growth["cumulative"]
 
         if len(monthly) < 2:
-            lines.append("\n*Not enough history to show growth trends (need 2+ months).*")
-            self.sections.append("\n".join(lines))
+            w("\n*Not enough history to show growth trends (need 2+ months).*\n")
             return
 
         # Monthly commits chart
-        lines.append("\n### Monthly Commit Volume\n")
-        lines.append("```")
-        lines.append(fmt_bar_chart(monthly, width=40, title="Commits per Month"))
-        lines.append("```")
+        w("\n### Monthly Commit Volume\n\n")
+        w("```\n")
+        fmt_bar_chart_into(self._out, monthly, width=40, title="Commits per Month")
+        w("\n```\n")
 
         # Cumulative growth
-        lines.append("\n### Cumulative Commits\n")
-        lines.append("```")
-        lines.append(fmt_bar_chart(cumulative, width=40, title="Total Commits Over Time"))
-        lines.append("```")
+        w("\n### Cumulative Commits\n\n")
+        w("```\n")
+        fmt_bar_chart_into(self._out, cumulative, width=40, title="Total Commits Over Time")
+        w("\n```\n")
 
         # Sparklines
         if monthly:
-            lines.append(f"\n**Monthly volume**: `{fmt_sparkline(list(monthly.values()))}`")
+            w(f"\n**Monthly volume**: `{fmt_sparkline(monthly.values())}`\n")
         if cumulative:
-            lines.append(f"**Cumulative growth**: `{fmt_sparkline(list(cumulative.values()))}`")
-
-        self.sections.append("\n".join(lines))
+            w(f"**Cumulative growth**: `{fmt_sparkline(cumulative.values())}`\n")
 
     # ── Footer ────────────────────────────────────────────────────────
 
     def _add_footer(self) -> None:
-        elapsed = (datetime.now() - self.generated_at).total_seconds()
-        self.sections.append(
+        elapsed = time.monotonic() - self._t0
+        self._out.write(
             "---\n\n"
-            f"*Report generated by `git_report.py` in {elapsed:.1f}s*"
+            f"*Report generated by `git_report.py` in {elapsed:.1f}s*\n"
         )
 
     # ── Empty repo fallback ───────────────────────────────────────────
@@ -1131,6 +1200,7 @@ def main() -> None:
             "  python scripts/git_report.py --repo /path/to/repo\n"
             "  python scripts/git_report.py --output my_report.md\n"
             "  python scripts/git_report.py --top-n 30\n"
+            "  python scripts/git_report.py --sections overview,churn,growth\n"
         ),
     )
     parser.add_argument(
@@ -1145,8 +1215,20 @@ def main() -> None:
         "--top-n", type=int, default=20,
         help="Number of items in top-N lists (default: 20)",
     )
+    parser.add_argument(
+        "--sections", default=None,
+        help=f"Comma-separated sections to include (default: all). "
+             f"Choices: {','.join(REPORT_SECTIONS)}",
+    )
 
     args = parser.parse_args()
+
+    sections = None
+    if args.sections:
+        sections = [s.strip() for s in args.sections.split(",") if s.strip()]
+        unknown = [s for s in sections if s not in REPORT_SECTIONS]
+        if unknown:
+            parser.error(f"unknown section(s): {', '.join(unknown)}")
     repo = args.repo.resolve()
 
     # Validate
@@ -1158,21 +1240,26 @@ def main() -> None:
     print(f"Analyzing repository: {repo_root.name}")
     print(f"  Path: {repo_root}")
 
-    # Generate
-    generator = GitReportGenerator(repo_root, top_n=args.top_n)
-    report = generator.generate()
-
     # Determine output path
     if args.output:
         out_path = args.output.resolve()
     else:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out_dir = repo_root / "reports"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"git_stats_{ts}.md"
+        out_path = repo_root / "reports" / f"git_stats_{ts}.md"
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(report, encoding="utf-8")
+
+    # Generate, streaming sections into a sibling temp file that replaces
+    # out_path only once complete, so a failure never leaves a partial report
+    generator = GitReportGenerator(repo_root, top_n=args.top_n, sections=sections)
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+            generator.generate_to(f)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
     size_kb = out_path.stat().st_size / 1024
     print(f"\nReport saved to: {out_path}")
@@ -11,11 +11,20 @@ Usage:
     python snowflake_sync.py --dry-run          # Preview without writing
     python snowflake_sync.py --status           # Show sync state
     python snowflake_sync.py --tables turns     # Sync specific table(s)
+    python snowflake_sync.py --parallelism 1    # Sync one table at a time
+    python snowflake_sync.py --load-method copy # Always stage + COPY INTO
+    python snowflake_sync.py --watch 60         # Re-sync every minute on one session
+    python snowflake_sync.py --merge            # MERGE on id; never duplicate rows
+    python snowflake_sync.py --profile          # cProfile each table -> sync-*.pstats
+
+Rows are loaded either by staging a compressed CSV (PUT + COPY INTO, used for
+larger deltas) or with bound multi-row INSERTs (small deltas). Neither path
+needs pandas or pyarrow.
 
 Environment variables required:
     SNOWFLAKE_ACCOUNT               Account identifier
     SNOWFLAKE_USER                  Username
-    SNOWFLAKE_PRIVATE_KEY_PATH      Path to RSA private key PEM file
+    SNOWFLAKE_PRIVATE_KEY_PATH      Path to RSA private key PEM (or unencrypted .der) file
     SNOWFLAKE_WAREHOUSE             Warehouse name
     SNOWFLAKE_DATABASE              Target database
     SNOWFLAKE_SCHEMA                Target schema
@@ -24,14 +33,40 @@ Environment variables required:
 
 Dependencies (install separately):
     python -m pip install snowflake-connector-python cryptography
+    python -m pip install zstandard   # optional, faster stage-file compression
 """
 
 import argparse
+import collections
+import contextlib
+import cProfile
+import csv
+import functools
+import graphlib
+import gzip
+import io
+import operator
 import os
+import pstats
+import random
+import re
+import shutil
 import sqlite3
+import subprocess
 import sys
+import tempfile
+import threading
 import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from queue import Empty, Queue, SimpleQueue
+
+
+# KEY=value lines; comment lines never match since a key can't start with '#'
+_ENV_LINE_RE = re.compile(
+    r'^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE
+)
 
 
 def load_dotenv(env_path: Path = None):
@@ -41,21 +76,12 @@ def load_dotenv(env_path: Path = None):
     if not env_path.exists():
         return
     with open(env_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if '=' not in line:
-                continue
-            key, _, value = line.partition('=')
-            key = key.strip()
-            value = value.strip()
-            # Strip surrounding quotes
-            if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
-                value = value[1:-1]
-            if key not in os.environ:
-                os.environ[key] = value
-
+        data = f.read()
+    for key, value in _ENV_LINE_RE.findall(data):
+        # Strip surrounding quotes
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+            value = value[1:-1]
+        os.environ.setdefault(key, value)
 
 load_dotenv()
 
@@ -64,25 +90,52 @@ try:
     from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.backends import default_backend
 except ImportError:
-    print(
-        "Missing dependencies. Install with:\n"
-        "  python -m pip install snowflake-connector-python cryptography"
-    )
-    sys.exit(1)
+    # Reported by main(); the SQLite-side helpers stay importable for tests
+    snowflake = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # stage files fall back to gzip
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-DEFAULT_BATCH_SIZE = 5000
+DEFAULT_BATCH_SIZE = 50_000
 MAX_RETRIES = 3
+MAX_INTERFACE_RETRIES = 1  # connection-level failures rarely recover
 RETRY_BACKOFF_BASE = 2  # seconds
-
-# Sync order respects FK dependencies
-SYNC_ORDER = [
-    'sessions', 'turns', 'tool_calls', 'experiment_tags',
-    'daily_summaries', 'etl_state', 'snapshots',
-]
+RETRY_MAX_WAIT = 60  # seconds
+SYNC_MAX_WORKERS = 4
+READ_AHEAD_BATCHES = 2  # SQLite batches read ahead of the Snowflake load
+
+# Bulk loads go through a session-scoped internal stage: rows are written to
+# a compressed CSV (zstd, or gzip without zstandard), PUT once, then loaded
+# with a single COPY INTO. Below COPY_MIN_ROWS pending rows ('auto' load
+# method) the PUT/COPY round trips cost more than a bound INSERT, so small
+# deltas are inserted directly.
+# 'export' stages id-ranged and full-replace tables through the sqlite3 CLI
+# instead of Python (see export_rows); sessions still stage from Python as
+# their watermark is read off the rows.
+LOAD_METHODS = ('auto', 'copy', 'insert', 'export')
+COPY_MIN_ROWS = 5000
+# The connector's CLIENT_STAGE_ARRAY_BINDING_THRESHOLD default. An
+# executemany binding more values than this is uploaded through
+# CREATE TEMPORARY STAGE, and that DDL implicitly commits the open transaction
+# the rows and watermark share, so bound INSERTs are kept at or below it.
+ARRAY_BIND_MAX_VALUES = 65_280
+STAGE_NAME = '_ccwap_sync_stage'
+NULL_MARKER = '\\N'
+CSV_FILE_FORMAT = (
+    "TYPE = CSV COMPRESSION = AUTO "
+    "FIELD_OPTIONALLY_ENCLOSED_BY = '\"' "
+    "NULL_IF = ('\\\\N') EMPTY_FIELD_AS_NULL = FALSE"
+)
+# The sqlite3 CLI only quotes fields that need it, so unquoted Windows paths
+# like C:\Users\foo must not have their backslashes read as escapes. With no
+# escape character the bare \N the CLI writes for NULL still matches NULL_IF.
+EXPORT_FILE_FORMAT = CSV_FILE_FORMAT + " ESCAPE_UNENCLOSED_FIELD = NONE"
 
 # ---------------------------------------------------------------------------
 # Centralized table configuration
@@ -92,6 +145,7 @@ TABLE_CONFIG = {
     'sessions': {
         'strategy': 'upsert',
         'primary_key': 'session_id',
+        'depends_on': [],
         'columns': [
             ('session_id', 'VARCHAR(200)', 'NOT NULL PRIMARY KEY'),
             ('project_path', 'VARCHAR(1000)', 'NOT NULL'),
@@ -112,6 +166,7 @@ TABLE_CONFIG = {
     'turns': {
         'strategy': 'incremental_id',
         'primary_key': 'id',
+        'depends_on': ['sessions'],
         'columns': [
             ('id', 'INTEGER', 'NOT NULL PRIMARY KEY'),
             ('session_id', 'VARCHAR(200)', 'NOT NULL'),
@@ -141,6 +196,7 @@ TABLE_CONFIG = {
     'tool_calls': {
         'strategy': 'incremental_id',
         'primary_key': 'id',
+        'depends_on': ['turns'],
         'columns': [
             ('id', 'INTEGER', 'NOT NULL PRIMARY KEY'),
             ('turn_id', 'INTEGER', 'NOT NULL'),
@@ -164,6 +220,7 @@ TABLE_CONFIG = {
     'experiment_tags': {
         'strategy': 'incremental_id',
         'primary_key': 'id',
+        'depends_on': ['sessions'],
         'columns': [
             ('id', 'INTEGER', 'NOT NULL PRIMARY KEY'),
             ('tag_name', 'VARCHAR(200)', 'NOT NULL'),
@@ -174,6 +231,7 @@ TABLE_CONFIG = {
     'daily_summaries': {
         'strategy': 'full_replace',
         'primary_key': 'date',
+        'depends_on': [],
         'columns': [
             ('date', 'VARCHAR(10)', 'NOT NULL PRIMARY KEY'),
             ('sessions', 'INTEGER', 'DEFAULT 0'),
@@ -201,6 +259,7 @@ TABLE_CONFIG = {
     'etl_state': {
         'strategy': 'full_replace',
         'primary_key': 'file_path',
+        'depends_on': [],
         'columns': [
             ('file_path', 'VARCHAR(1000)', 'NOT NULL PRIMARY KEY'),
             ('last_mtime', 'FLOAT', ''),
@@ -214,6 +273,9 @@ TABLE_CONFIG = {
     'snapshots': {
         'strategy': 'incremental_id',
         'primary_key': 'id',
+        'depends_on': [],
+        # summary_json can be megabytes per row; keep each fetch small
+        'max_batch_size': 100,
         'columns': [
             ('id', 'INTEGER', 'NOT NULL PRIMARY KEY'),
             ('timestamp', 'VARCHAR(50)', 'NOT NULL'),
@@ -224,6 +286,109 @@ TABLE_CONFIG = {
     },
 }
 
+
+
+def _prepare_table_config():
+    """Precompute column lists, DDL and SQL text for each TABLE_CONFIG entry."""
+    for table_name, config in TABLE_CONFIG.items():
+        columns = [c[0] for c in config['columns']]
+        col_list = ', '.join(columns)
+        config['col_names'] = columns
+        config['col_list'] = col_list
+        config['col_index'] = {name: i for i, name in enumerate(columns)}
+        config['placeholders'] = ', '.join(['?'] * len(columns))
+
+        col_defs = []
+        for col_name, col_type, constraints in config['columns']:
+            parts = [col_name, col_type]
+            if constraints:
+                parts.append(constraints)
+            col_defs.append(' '.join(parts))
+        cols_sql = ',\n    '.join(col_defs)
+        config['create_ddl'] = (
+            f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {cols_sql}\n)"
+        )
+
+        # The CLI prints REALs with 15 significant digits; %!.17g round-trips
+        # every double (typeof() leaves NULLs and non-REAL values alone)
+        export_cols = ', '.join(
+            f"CASE WHEN typeof({name}) = 'real' THEN printf('%!.17g', {name}) "
+            f"ELSE {name} END"
+            if col_type == 'FLOAT' else name
+            for name, col_type, _ in config['columns']
+        )
+        config['export_select'] = f"SELECT {export_cols} FROM {table_name}"
+
+        # Read-side SQL shared by the sync strategies and --dry-run
+        strategy = config['strategy']
+        if strategy == 'incremental_id':
+            config['high_id_sql'] = f"SELECT MAX(id) FROM {table_name}"
+            config['select_sql'] = (
+                f"SELECT {col_list} FROM {table_name} "
+                "WHERE id > ? AND id <= ? ORDER BY id"
+            )
+            config['page_sql'] = config['select_sql'] + " LIMIT ?"
+        elif strategy == 'upsert':
+            changed = "WHERE file_mtime > ? OR file_mtime IS NULL"
+            config['count_sql'] = f"SELECT COUNT(*) FROM {table_name} {changed}"
+            config['select_sql'] = (
+                f"SELECT {col_list} FROM {table_name} {changed} "
+                f"ORDER BY {config['primary_key']}"
+            )
+        elif strategy == 'full_replace':
+            config['count_sql'] = f"SELECT COUNT(*) FROM {table_name}"
+            config['select_sql'] = f"SELECT {col_list} FROM {table_name}"
+            config['swap_table'] = f"_swap_{table_name}"
+
+        # sessions always MERGE from a temp table (inserts + updates);
+        # incremental tables do so with --merge, inserting only unseen ids
+        if strategy in ('upsert', 'incremental_id'):
+            pk = config['primary_key']
+            tmp_table = f"_tmp_{table_name}"
+            when_matched = ''
+            if strategy == 'upsert':
+                set_clause = ', '.join(
+                    f"target.{c} = source.{c}" for c in columns if c != pk
+                )
+                when_matched = f"WHEN MATCHED THEN UPDATE SET {set_clause} "
+            insert_vals = ', '.join(f"source.{c}" for c in columns)
+            config['tmp_table'] = tmp_table
+            config['merge_sql'] = (
+                f"MERGE INTO {table_name} AS target "
+                f"USING {tmp_table} AS source "
+                f"ON target.{pk} = source.{pk} "
+                f"{when_matched}"
+                f"WHEN NOT MATCHED THEN INSERT ({col_list}) VALUES ({insert_vals})"
+            )
+
+
+_prepare_table_config()
+
+
+def _dependency_levels() -> list:
+    """Group tables into levels whose 'depends_on' tables are all in earlier levels.
+
+    Tables keep their TABLE_CONFIG order within a level. Raises
+    graphlib.CycleError if the dependencies form a cycle.
+    """
+    position = {table: i for i, table in enumerate(TABLE_CONFIG)}
+    sorter = graphlib.TopologicalSorter(
+        {table: config['depends_on'] for table, config in TABLE_CONFIG.items()}
+    )
+    sorter.prepare()
+    levels = []
+    while sorter.is_active():
+        level = sorted(sorter.get_ready(), key=position.__getitem__)
+        levels.append(level)
+        sorter.done(*level)
+    return levels
+
+
+# Tables that share a level can sync concurrently; sync_tables starts each
+# table as soon as its own dependencies finish rather than level by level.
+SYNC_LEVELS = _dependency_levels()
+SYNC_ORDER = [table for level in SYNC_LEVELS for table in level]
+
 SYNC_STATE_DDL = """
 CREATE TABLE IF NOT EXISTS _sync_state (
     table_name VARCHAR(100) NOT NULL PRIMARY KEY,
@@ -234,33 +399,64 @@ CREATE TABLE IF NOT EXISTS _sync_state (
 )
 """
 
+# All CREATE TABLE IF NOT EXISTS statements, sent as one multi-statement request
+SCHEMA_DDL = [SYNC_STATE_DDL.strip()] + [
+    config['create_ddl'] for config in TABLE_CONFIG.values()
+]
+
+# Recorded in _sync_state (as last_synced_id of the SCHEMA_VERSION_KEY row)
+# once the DDL has run, so later runs can skip it. Bump whenever SCHEMA_DDL
+# changes.
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = '_schema_version'
+
 # ---------------------------------------------------------------------------
 # Connection helpers
 # ---------------------------------------------------------------------------
 
+_private_key_cache = {}
+_private_key_lock = threading.Lock()
+
+
 def load_private_key(key_path: str) -> bytes:
-    """Load RSA private key from PEM file, return DER-encoded bytes."""
+    """Load RSA private key from PEM (or DER) file, return DER-encoded bytes.
+
+    The result is cached per (path, mtime) so pooled worker connections
+    don't each repeat the PEM decode.
+    """
     path = Path(key_path).expanduser()
     if not path.exists():
         raise FileNotFoundError(f"RSA private key not found at {path}")
 
-    with open(path, 'rb') as f:
-        pem_data = f.read()
-
-    passphrase = os.environ.get('SNOWFLAKE_PRIVATE_KEY_PASSPHRASE')
-    passphrase_bytes = passphrase.encode() if passphrase else None
-
-    private_key = serialization.load_pem_private_key(
-        pem_data,
-        password=passphrase_bytes,
-        backend=default_backend(),
-    )
-
-    return private_key.private_bytes(
-        encoding=serialization.Encoding.DER,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption(),
-    )
+    cache_key = (str(path), path.stat().st_mtime_ns)
+    with _private_key_lock:
+        cached = _private_key_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with open(path, 'rb') as f:
+            key_data = f.read()
+
+        if path.suffix.lower() == '.der':
+            # Already DER (unencrypted PKCS#8); hand it to the connector as-is
+            der_bytes = key_data
+        else:
+            passphrase = os.environ.get('SNOWFLAKE_PRIVATE_KEY_PASSPHRASE')
+            passphrase_bytes = passphrase.encode() if passphrase else None
+
+            private_key = serialization.load_pem_private_key(
+                key_data,
+                password=passphrase_bytes,
+                backend=default_backend(),
+            )
+            der_bytes = private_key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+
+        _private_key_cache[cache_key] = der_bytes
+        return der_bytes
 
 
 def get_snowflake_connection():
@@ -287,15 +483,31 @@ def get_snowflake_connection():
         database=os.environ['SNOWFLAKE_DATABASE'],
         schema=os.environ['SNOWFLAKE_SCHEMA'],
         role=role,
+        client_session_keep_alive=True,
+        client_session_keep_alive_heartbeat_frequency=900,
+        client_prefetch_threads=8,
+        # Server-side binding: executemany INSERTs are sent as bound arrays
+        # rather than rendered into SQL text row by row in Python
+        paramstyle='qmark',
+        session_parameters={'QUERY_TAG': 'ccwap_sync'},
     )
 
 
-def get_sqlite_connection() -> sqlite3.Connection:
-    """Open the CCWAP SQLite database in read-only mode."""
+@functools.lru_cache(maxsize=1)
+def get_db_path() -> Path:
+    """Resolve the CCWAP database path, loading the config once per process."""
     from ccwap.config.loader import load_config, get_database_path
 
-    config = load_config()
-    db_path = get_database_path(config)
+    return get_database_path(load_config())
+
+
+def get_sqlite_connection() -> sqlite3.Connection:
+    """Open the CCWAP SQLite database in read-only mode.
+
+    The connection may be handed between sync worker threads (never used by
+    two at once), so the same-thread check is disabled.
+    """
+    db_path = get_db_path()
 
     if not db_path.exists():
         raise FileNotFoundError(
@@ -303,130 +515,167 @@ def get_sqlite_connection() -> sqlite3.Connection:
             "Run 'python -m ccwap' first to populate the database."
         )
 
-    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                           check_same_thread=False)
+    # Read-side tuning for the large sequential scans. Not immutable=1: the
+    # database is in WAL mode and may be written by ccwap while we read.
+    # synchronous / read_uncommitted only affect writers and shared-cache
+    # connections, and journal_mode=OFF fails on a read-only WAL database,
+    # so none of those are set here.
+    conn.execute("PRAGMA mmap_size=268435456")  # 256MB
+    conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA query_only=ON")
     return conn
 
 
+def ensure_sqlite_wal(db_path: Path):
+    """Switch the source database to WAL so sync reads don't block ccwap writes.
+
+    ccwap enables WAL on its own connections; this covers databases last
+    opened by an older version. The read-only sync connection can't change
+    the journal mode, so a short-lived read-write connection does it. A
+    failure (e.g. read-only file) only warns.
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != 'wal':
+                conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as e:
+        print(f"Warning: could not enable WAL on {db_path}: {e}")
+
+
 # ---------------------------------------------------------------------------
 # Snowflake schema management
 # ---------------------------------------------------------------------------
 
-def _build_create_ddl(table_name: str, config: dict) -> str:
-    """Build CREATE TABLE IF NOT EXISTS DDL from TABLE_CONFIG."""
-    col_defs = []
-    for col_name, col_type, constraints in config['columns']:
-        parts = [col_name, col_type]
-        if constraints:
-            parts.append(constraints)
-        col_defs.append(' '.join(parts))
-    cols_sql = ',\n    '.join(col_defs)
-    return f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {cols_sql}\n)"
-
-
-def _use_database(sf_conn) -> bool:
+def _use_database(sf_cur) -> bool:
     """Set session database and schema context. Returns True if successful."""
     db = os.environ['SNOWFLAKE_DATABASE']
     schema = os.environ['SNOWFLAKE_SCHEMA']
-    cursor = sf_conn.cursor()
     try:
-        cursor.execute(f"USE DATABASE {db}")
-        cursor.execute(f"USE SCHEMA {schema}")
+        sf_cur.execute(f"USE DATABASE {db}")
+        sf_cur.execute(f"USE SCHEMA {schema}")
         return True
     except snowflake.connector.errors.ProgrammingError:
         return False
-    finally:
-        cursor.close()
 
 
-def ensure_snowflake_schema(sf_conn):
+def ensure_snowflake_schema(sf_cur):
     """Create database, schema, and all tables in Snowflake if they don't exist."""
     db = os.environ['SNOWFLAKE_DATABASE']
     schema = os.environ['SNOWFLAKE_SCHEMA']
-    cursor = sf_conn.cursor()
 
     # Try USE first; fall back to CREATE if the database doesn't exist
     try:
-        cursor.execute(f"USE DATABASE {db}")
+        sf_cur.execute(f"USE DATABASE {db}")
     except snowflake.connector.errors.ProgrammingError:
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db}")
-        cursor.execute(f"USE DATABASE {db}")
+        sf_cur.execute(f"CREATE DATABASE IF NOT EXISTS {db}")
+        sf_cur.execute(f"USE DATABASE {db}")
 
     try:
-        cursor.execute(f"USE SCHEMA {schema}")
+        sf_cur.execute(f"USE SCHEMA {schema}")
     except snowflake.connector.errors.ProgrammingError:
-        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
-        cursor.execute(f"USE SCHEMA {schema}")
+        sf_cur.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        sf_cur.execute(f"USE SCHEMA {schema}")
+
+    sf_cur.execute(';\n'.join(SCHEMA_DDL), num_statements=len(SCHEMA_DDL))
+    update_sync_state(sf_cur, SCHEMA_VERSION_KEY, last_synced_id=SCHEMA_VERSION)
+
+
+def _needs_schema_bootstrap(sf_cur) -> bool:
+    """Return False if the recorded schema version is current (context is set)."""
+    if not _use_database(sf_cur):
+        return True
+    try:
+        sf_cur.execute(
+            "SELECT last_synced_id FROM _sync_state WHERE table_name = ?",
+            (SCHEMA_VERSION_KEY,),
+        )
+        row = sf_cur.fetchone()
+    except snowflake.connector.errors.ProgrammingError:
+        return True  # _sync_state doesn't exist yet
+    return row is None or row[0] != SCHEMA_VERSION
 
-    cursor.execute(SYNC_STATE_DDL)
-    for table_name, config in TABLE_CONFIG.items():
-        cursor.execute(_build_create_ddl(table_name, config))
-    cursor.close()
 
+def drop_tables(sf_cur, tables: list):
+    """Drop specified tables and clear their watermarks for full reload.
 
-def drop_tables(sf_conn, tables: list):
-    """Drop specified tables plus _sync_state for full reload."""
-    cursor = sf_conn.cursor()
+    Only the reloaded tables' _sync_state rows are removed; dropping the whole
+    state table would reset every other table's watermark and make the next
+    incremental run re-insert rows it already loaded.
+    """
     # Drop in reverse dependency order
     reverse_order = list(reversed(SYNC_ORDER))
     for table in reverse_order:
         if table in tables:
-            cursor.execute(f"DROP TABLE IF EXISTS {table}")
-    cursor.execute("DROP TABLE IF EXISTS _sync_state")
-    cursor.close()
+            sf_cur.execute(f"DROP TABLE IF EXISTS {table}")
+    if tables:
+        placeholders = ', '.join(['?'] * len(tables))
+        try:
+            sf_cur.execute(
+                f"DELETE FROM _sync_state WHERE table_name IN ({placeholders})",
+                tuple(tables),
+            )
+        except snowflake.connector.errors.ProgrammingError:
+            pass  # _sync_state doesn't exist yet; nothing to clear
 
 
 # ---------------------------------------------------------------------------
 # Sync state tracking (_sync_state table)
 # ---------------------------------------------------------------------------
 
-def get_sync_state(sf_conn, table_name: str) -> dict:
-    """Read the sync watermark for a given table."""
-    cursor = sf_conn.cursor()
+EMPTY_SYNC_STATE = {'last_synced_id': None, 'last_synced_timestamp': None, 'rows_synced': 0}
+
+
+def get_sync_states(sf_cur) -> dict:
+    """Read every table's sync watermark in one query.
+
+    Returns {table_name: state}; tables with no row yet are absent, so look
+    them up with .get(table, EMPTY_SYNC_STATE).
+    """
     try:
-        cursor.execute(
-            "SELECT last_synced_id, last_synced_timestamp, rows_synced "
-            "FROM _sync_state WHERE table_name = %s",
-            (table_name,),
+        sf_cur.execute(
+            "SELECT table_name, last_synced_id, last_synced_timestamp, rows_synced "
+            "FROM _sync_state"
         )
-        row = cursor.fetchone()
+        rows = sf_cur.fetchall()
     except snowflake.connector.errors.ProgrammingError:
         # _sync_state table doesn't exist yet (e.g. first dry-run)
-        row = None
-    cursor.close()
-    if row:
-        return {
-            'last_synced_id': row[0],
-            'last_synced_timestamp': row[1],
-            'rows_synced': row[2],
+        rows = []
+    return {
+        table_name: {
+            'last_synced_id': last_id,
+            'last_synced_timestamp': last_ts,
+            'rows_synced': rows_synced,
         }
-    return {'last_synced_id': None, 'last_synced_timestamp': None, 'rows_synced': 0}
+        for table_name, last_id, last_ts, rows_synced in rows
+    }
 
 
-def update_sync_state(sf_conn, table_name: str, *,
+def update_sync_state(sf_cur, table_name: str, *,
                       last_synced_id=None, last_synced_timestamp=None,
                       rows_synced=0):
     """Upsert the sync watermark for a table."""
-    cursor = sf_conn.cursor()
-    cursor.execute(
+    sf_cur.execute(
         "MERGE INTO _sync_state AS t "
-        "USING (SELECT %s AS table_name) AS s "
+        "USING (SELECT ? AS table_name, ? AS last_synced_id, "
+        "       ? AS last_synced_timestamp, ? AS rows_synced) AS s "
         "ON t.table_name = s.table_name "
         "WHEN MATCHED THEN UPDATE SET "
-        "  last_synced_id = %s, "
-        "  last_synced_timestamp = %s, "
-        "  rows_synced = t.rows_synced + %s, "
+        "  last_synced_id = s.last_synced_id, "
+        "  last_synced_timestamp = s.last_synced_timestamp, "
+        "  rows_synced = t.rows_synced + s.rows_synced, "
         "  last_sync_at = CURRENT_TIMESTAMP() "
         "WHEN NOT MATCHED THEN INSERT "
         "  (table_name, last_synced_id, last_synced_timestamp, rows_synced) "
-        "  VALUES (%s, %s, %s, %s)",
-        (
-            table_name,
-            last_synced_id, last_synced_timestamp, rows_synced,
-            table_name, last_synced_id, last_synced_timestamp, rows_synced,
-        ),
+        "  VALUES (s.table_name, s.last_synced_id, s.last_synced_timestamp, "
+        "          s.rows_synced)",
+        (table_name, last_synced_id, last_synced_timestamp, rows_synced),
     )
-    cursor.close()
 
 
 # ---------------------------------------------------------------------------
@@ -434,7 +683,7 @@ def update_sync_state(sf_conn, table_name: str, *,
 # ---------------------------------------------------------------------------
 
 def execute_with_retry(cursor, sql, params=None, *, many=False):
-    """Execute SQL with exponential-backoff retry for transient errors."""
+    """Execute SQL with jittered exponential-backoff retry for transient errors."""
     for attempt in range(MAX_RETRIES + 1):
         try:
             if many:
@@ -447,289 +696,755 @@ def execute_with_retry(cursor, sql, params=None, *, many=False):
         except snowflake.connector.errors.ProgrammingError:
             raise  # syntax / schema errors — not retryable
         except (snowflake.connector.errors.OperationalError,
-                snowflake.connector.errors.DatabaseError) as e:
-            if attempt < MAX_RETRIES:
-                wait = RETRY_BACKOFF_BASE ** attempt
-                print(f"  Retry {attempt + 1}/{MAX_RETRIES} in {wait}s: {e}")
+                snowflake.connector.errors.DatabaseError,
+                snowflake.connector.errors.InterfaceError) as e:
+            if isinstance(e, snowflake.connector.errors.InterfaceError):
+                retries = MAX_INTERFACE_RETRIES
+            else:
+                retries = MAX_RETRIES
+            if attempt < retries:
+                # Jitter keeps parallel workers from retrying in lockstep
+                backoff = RETRY_BACKOFF_BASE ** attempt
+                wait = min(RETRY_MAX_WAIT, backoff + random.uniform(0, backoff * 0.5))
+                print(f"  Retry {attempt + 1}/{retries} in {wait:.1f}s: {e}")
                 time.sleep(wait)
             else:
                 raise
 
 
+@contextlib.contextmanager
+def transaction(sf_cur):
+    """Run the enclosed statements in one explicit transaction.
+
+    Snowflake commits implicitly around DDL (CREATE STAGE, CREATE TABLE,
+    DROP) and PUT is not transactional, so only DML belongs inside.
+    """
+    execute_with_retry(sf_cur, "BEGIN")
+    try:
+        yield
+    except BaseException:
+        try:
+            sf_cur.execute("ROLLBACK")
+        except snowflake.connector.errors.Error:
+            pass  # e.g. the connection itself failed; report the original error
+        raise
+    execute_with_retry(sf_cur, "COMMIT")
+
+
+# ---------------------------------------------------------------------------
+# Staged bulk loading (PUT + COPY INTO)
+# ---------------------------------------------------------------------------
+
+def open_stage_file(path: str):
+    """Open a text stream that writes compressed CSV to path.
+
+    zstd level 3 (multithreaded) compresses several times faster than gzip
+    at a similar ratio; gzip is used when zstandard isn't installed.
+    """
+    if zstandard is None:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+    return io.TextIOWrapper(compressor.stream_writer(open(path, 'wb')),
+                            encoding='utf-8', newline='')
+
+
+def stage_rows(sf_cur, table_name: str, batches, on_batch=None) -> int:
+    """Write row batches to a compressed CSV and PUT it to the sync stage.
+
+    ``on_batch(rows_staged, batch)`` is called after each batch is written.
+    Returns the number of rows staged (nothing is uploaded when zero).
+    """
+    rows_staged = 0
+    with tempfile.TemporaryDirectory(prefix='ccwap_sync_') as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, f'{table_name}.csv.{"zst" if zstandard else "gz"}')
+        with open_stage_file(tmp_path) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+            for batch in batches:
+                writer.writerows(
+                    [NULL_MARKER if v is None else v for v in row] for row in batch
+                )
+                rows_staged += len(batch)
+                if on_batch:
+                    on_batch(rows_staged, batch)
+
+        if rows_staged:
+            put_file(sf_cur, table_name, tmp_path)
+    return rows_staged
+
+
+def export_rows(sqlite_conn, sf_cur, table_name: str, sql: str) -> bool:
+    """Export a query's rows with the sqlite3 CLI and PUT them to the sync stage.
+
+    The CLI writes the CSV natively, so rows are never materialized as Python
+    tuples. sql must be complete (no parameters) and should select from the
+    table's 'export_select'; load the file with EXPORT_FILE_FORMAT. Returns
+    True if any rows were staged.
+    """
+    db_path = sqlite_conn.execute("PRAGMA database_list").fetchone()[2]
+    with tempfile.TemporaryDirectory(prefix='ccwap_sync_') as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, f'{table_name}.csv')
+        with open(tmp_path, 'wb') as f:
+            try:
+                subprocess.run(
+                    ['sqlite3', '-readonly', '-batch', '-bail', '-csv', '-noheader',
+                     '-nullvalue', NULL_MARKER, '-newline', '\n', db_path, sql],
+                    stdout=f, stderr=subprocess.PIPE, check=True,
+                )
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(
+                    f"sqlite3 export of {table_name} failed: "
+                    f"{e.stderr.decode(errors='replace').strip()}"
+                ) from e
+        staged = os.path.getsize(tmp_path) > 0
+        if staged:
+            put_file(sf_cur, table_name, tmp_path, auto_compress=True)
+    return staged
+
+
+# Session ids whose temporary stage has been created. A session is only ever
+# used by one worker at a time, so the check-then-add needs no lock.
+_sessions_with_stage = set()
+
+
+def ensure_stage(sf_cur):
+    """Create the temporary sync stage once per Snowflake session."""
+    session_id = sf_cur.connection.session_id
+    if session_id not in _sessions_with_stage:
+        execute_with_retry(sf_cur, f"CREATE TEMPORARY STAGE IF NOT EXISTS {STAGE_NAME}")
+        _sessions_with_stage.add(session_id)
+
+
+def put_file(sf_cur, table_name: str, path: str, auto_compress: bool = False):
+    """PUT a local CSV file to the sync stage under table_name/.
+
+    Callers always stage a table's file under the same name, so OVERWRITE
+    replaces anything a failed earlier run on this session left behind and
+    each COPY sees exactly one file.
+    """
+    if auto_compress:
+        compression = "AUTO_COMPRESS = TRUE"
+    elif path.endswith('.zst'):
+        compression = "AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = ZSTD"
+    else:
+        compression = "AUTO_COMPRESS = FALSE"
+    ensure_stage(sf_cur)
+    execute_with_retry(
+        sf_cur,
+        f"PUT 'file://{Path(path).as_posix()}' @{STAGE_NAME}/{table_name}/ "
+        f"{compression} OVERWRITE = TRUE PARALLEL = 8",
+    )
+
+
+def copy_staged(sf_cur, table_name: str, target: str, col_list: str,
+                file_format: str = CSV_FILE_FORMAT) -> int:
+    """COPY the files staged for table_name into target, purging them after.
+
+    Returns the rows loaded, from COPY's result row.
+    """
+    execute_with_retry(
+        sf_cur,
+        f"COPY INTO {target} ({col_list}) FROM @{STAGE_NAME}/{table_name}/ "
+        f"FILE_FORMAT = ({file_format}) ON_ERROR = ABORT_STATEMENT PURGE = TRUE",
+    )
+    # One file per table (see put_file), so one result row: (file, status,
+    # rows_parsed, rows_loaded, ...), or a lone status column if none found
+    row = sf_cur.fetchone()
+    return row[3] if row and len(row) > 3 else 0
+
+
+def use_copy(load_method: str, pending: int) -> bool:
+    """Return True to load via PUT + COPY, False for bound INSERTs."""
+    if load_method == 'auto':
+        return pending >= COPY_MIN_ROWS
+    return load_method in ('copy', 'export')
+
+
+def insert_rows(sf_cur, target: str, config: dict, batches, on_batch=None) -> int:
+    """INSERT row batches into target with executemany; returns rows inserted."""
+    insert_sql = (
+        f"INSERT INTO {target} ({config['col_list']}) VALUES ({config['placeholders']})"
+    )
+    # Stay under the array-binding stage threshold (see ARRAY_BIND_MAX_VALUES)
+    max_rows = max(1, ARRAY_BIND_MAX_VALUES // len(config['col_names']))
+    rows_inserted = 0
+    for batch in batches:
+        for start in range(0, len(batch), max_rows):
+            execute_with_retry(sf_cur, insert_sql, batch[start:start + max_rows],
+                               many=True)
+        rows_inserted += len(batch)
+        if on_batch:
+            on_batch(rows_inserted, batch)
+    return rows_inserted
+
+
 # ---------------------------------------------------------------------------
 # Progress reporting
 # ---------------------------------------------------------------------------
 
-def print_progress(table: str, done: int, total: int, suffix: str = ''):
-    """In-place progress update via carriage return."""
+PROGRESS_INTERVAL = 5.0  # seconds between a table's lines when several sync
+
+_progress_lock = threading.Lock()
+# Tables currently syncing, the table whose in-place line is still open (no
+# newline yet), and when each table last printed a line
+_progress = {'active': 0, 'inline': None}
+_progress_printed_at = {}
+
+
+@contextlib.contextmanager
+def tracking_progress():
+    """Count a table as syncing for print_progress while the block runs."""
+    with _progress_lock:
+        _progress['active'] += 1
+    try:
+        yield
+    finally:
+        with _progress_lock:
+            _progress['active'] -= 1
+
+
+def print_progress(table: str, done: int, total: int, suffix: str = '',
+                   approx: bool = False):
+    """Report a table's progress.
+
+    With at most one table syncing the line is updated in place via carriage
+    return. While several sync concurrently, each table instead prints a full
+    line at most every PROGRESS_INTERVAL seconds so they don't overwrite each
+    other. The final line is always printed. An approx total is an
+    upper-bound estimate shown with a '~' prefix; such updates are never
+    treated as the final line for the table.
+    """
+    final = done >= total and not approx
     if total == 0:
-        sys.stdout.write(f'\r  {table:<20} no new rows to sync')
+        line = f'  {table:<20} no new rows to sync'
     else:
         pct = done / total * 100
-        sys.stdout.write(
-            f'\r  {table:<20} {done:>8,}/{total:,} ({pct:5.1f}%)'
+        line = (
+            f'  {table:<20} {done:>8,}/{"~" if approx else ""}{total:,} '
+            f'({pct:5.1f}%)'
             f'{" — " + suffix if suffix else ""}'
         )
-    sys.stdout.flush()
-    if done >= total:
-        sys.stdout.write('\n')
+    with _progress_lock:
+        inline = _progress['inline']
+        if final or _progress['active'] <= 1:
+            # Close another table's open line rather than overwrite it
+            start = '\n' if inline not in (None, table) else '\r'
+            sys.stdout.write(start + line + ('\n' if final else ''))
+            _progress['inline'] = None if final else table
+        else:
+            now = time.monotonic()
+            if now - _progress_printed_at.get(table, 0) < PROGRESS_INTERVAL:
+                return
+            _progress_printed_at[table] = now
+            sys.stdout.write(('\n' if inline else '') + line + '\n')
+            _progress['inline'] = None
+        sys.stdout.flush()
 
 
 # ---------------------------------------------------------------------------
 # Sync strategies
 # ---------------------------------------------------------------------------
 
-def _col_names(config: dict) -> list:
-    """Extract column name list from TABLE_CONFIG entry."""
-    return [c[0] for c in config['columns']]
-
+def iter_batches(sqlite_cur, batch_size: int):
+    """Iterate lists of up to batch_size rows from a SQLite cursor."""
+    sqlite_cur.arraysize = batch_size
 
-def sync_incremental_by_id(sqlite_conn, sf_conn, table_name: str,
-                           config: dict, batch_size: int) -> int:
-    """Sync rows where id > last_synced_id. For append-only tables."""
-    state = get_sync_state(sf_conn, table_name)
+    def fetch():
+        try:
+            yield from iter(sqlite_cur.fetchmany, [])
+        finally:
+            sqlite_cur.close()  # on the reader thread, before it exits
+
+    return read_ahead(fetch())
+
+
+def iter_id_pages(sqlite_conn, page_sql: str, last_id: int, high_id: int,
+                  batch_size: int):
+    """Iterate batches of rows with last_id < id <= high_id, one query per batch.
+
+    id is the rowid, so each page is a b-tree seek plus a range read. Unlike
+    one long-running cursor, no read transaction stays open between pages,
+    so a slow upload doesn't hold back WAL checkpoints in ccwap.
+    """
+    def pages():
+        start = last_id
+        while start < high_id:
+            batch = sqlite_conn.execute(page_sql, (start, high_id, batch_size)).fetchall()
+            if not batch:
+                return
+            yield batch
+            start = batch[-1][0]  # id is first column
+
+    return read_ahead(pages())
+
+
+def read_ahead(batches, depth: int = READ_AHEAD_BATCHES):
+    """Yield from batches while a background thread reads up to depth ahead.
+
+    sqlite3 releases the GIL while stepping the query, so the next batch is
+    read while the previous one is written to the stage file or inserted
+    into Snowflake. Nothing is read until the first batch is requested.
+
+    Callers must close() the returned generator (see contextlib.closing)
+    even when they stop early or fail: that stops and joins the reader, so
+    the SQLite connection is idle again before it is handed to another
+    worker. batches is closed on the reader thread if it has a close().
+    """
+    buffer = Queue(maxsize=depth)
+    stop = threading.Event()
+    end = object()
+
+    def produce():
+        source = iter(batches)
+        try:
+            # stop is checked before each read, so none starts after shutdown
+            while not stop.is_set():
+                batch = next(source, end)
+                if stop.is_set():
+                    return
+                buffer.put(batch)
+                if batch is end:
+                    return
+        except Exception as e:
+            if not stop.is_set():
+                buffer.put(e)
+        finally:
+            close = getattr(source, 'close', None)
+            if close is not None:
+                close()
+
+    reader = threading.Thread(target=produce, name='sqlite-read-ahead', daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is end:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Free a slot so a blocked put() returns and the reader sees stop
+        stop.set()
+        while not buffer.empty():
+            buffer.get_nowait()
+        reader.join()
+
+
+def sync_incremental_by_id(sqlite_conn, sf_cur, table_name: str,
+                           config: dict, state: dict, batch_size: int,
+                           load_method: str = 'auto', merge: bool = False,
+                           high_id: int = None) -> int:
+    """Sync rows where last_synced_id < id <= high_id. For append-only tables.
+
+    high_id defaults to the table's current MAX(id) (see get_high_ids).
+    With merge, rows land in a temp table and are MERGEd on id, so ids that
+    are already in Snowflake (e.g. after a lost watermark) aren't duplicated.
+    """
     last_id = state['last_synced_id'] or 0
 
-    columns = _col_names(config)
-    col_list = ', '.join(columns)
+    col_list = config['col_list']
 
-    # Count pending rows
-    count_row = sqlite_conn.execute(
-        f"SELECT COUNT(*) FROM {table_name} WHERE id > ?", (last_id,)
-    ).fetchone()
-    total = count_row[0]
+    # MAX(id) is a single b-tree seek, unlike COUNT(*) over the pending
+    # range. Gaps in id make high_id - last_id an upper bound on the rows.
+    if high_id is None:
+        high_id = sqlite_conn.execute(config['high_id_sql']).fetchone()[0]
+    high_id = high_id or 0
 
-    if total == 0:
+    if high_id <= last_id:
         print_progress(table_name, 0, 0)
         return 0
 
-    placeholders = ', '.join(['%s'] * len(columns))
-    insert_sql = f"INSERT INTO {table_name} ({col_list}) VALUES ({placeholders})"
-
-    sqlite_cur = sqlite_conn.execute(
-        f"SELECT {col_list} FROM {table_name} WHERE id > ? ORDER BY id",
-        (last_id,),
-    )
-
-    sf_cur = sf_conn.cursor()
-    rows_synced = 0
+    estimate = high_id - last_id
     max_id = last_id
 
-    while True:
-        batch = sqlite_cur.fetchmany(batch_size)
-        if not batch:
-            break
-
-        rows = [tuple(row) for row in batch]
-        try:
-            execute_with_retry(sf_cur, insert_sql, rows, many=True)
-        except snowflake.connector.errors.IntegrityError as e:
-            # PK collision — fall back to row-by-row, skipping dupes
-            print(f"\n  {table_name}: PK conflict in batch, inserting row-by-row...")
-            for row in rows:
-                try:
-                    execute_with_retry(sf_cur, insert_sql, row)
-                except snowflake.connector.errors.IntegrityError:
-                    pass  # skip duplicate
-
-        rows_synced += len(rows)
-        max_id = rows[-1][0]  # id is first column
-        print_progress(table_name, rows_synced, total,
-                       f"ID {last_id + 1} -> {max_id}")
-
-    sf_cur.close()
-    update_sync_state(sf_conn, table_name,
-                      last_synced_id=max_id, rows_synced=rows_synced)
+    def on_batch(rows_staged, batch):
+        nonlocal max_id
+        max_id = batch[-1][0]  # id is first column
+        print_progress(table_name, rows_staged, estimate,
+                       f"ID {last_id + 1} -> {max_id}", approx=True)
+
+    copy = use_copy(load_method, estimate)
+    file_format = EXPORT_FILE_FORMAT if load_method == 'export' else CSV_FILE_FORMAT
+    pages = iter_id_pages(sqlite_conn, config['page_sql'],
+                          last_id, high_id, batch_size)
+    # Closing joins the reader even on failure, before the SQLite connection
+    # goes back to the pool for another worker
+    with contextlib.closing(pages) as batches:
+        if load_method == 'export':
+            # high_id is itself a row id, so it is the watermark after the load
+            export_sql = (
+                f"{config['export_select']} "
+                f"WHERE id > {int(last_id)} AND id <= {int(high_id)} ORDER BY id"
+            )
+            staged = export_rows(sqlite_conn, sf_cur, table_name, export_sql)
+            rows_synced, max_id = 0, high_id
+        elif copy:
+            rows_synced = stage_rows(sf_cur, table_name, batches, on_batch)
+            staged = rows_synced > 0
+
+        target = table_name
+        if merge:
+            # DDL commits implicitly, so the temp table is created before BEGIN
+            target = config['tmp_table']
+            execute_with_retry(
+                sf_cur, f"CREATE OR REPLACE TEMPORARY TABLE {target} LIKE {table_name}"
+            )
+
+        # Rows and watermark commit together, so a failed run never leaves
+        # loaded rows behind an old watermark (which would re-insert them)
+        with transaction(sf_cur):
+            if not copy:
+                rows_synced = insert_rows(sf_cur, target, config, batches, on_batch)
+            elif staged:
+                rows_synced = copy_staged(sf_cur, table_name, target, col_list,
+                                          file_format)
+            if merge:
+                execute_with_retry(sf_cur, config['merge_sql'])
+                rows_synced = sf_cur.fetchone()[0]  # rows inserted
+            update_sync_state(sf_cur, table_name,
+                              last_synced_id=max_id, rows_synced=rows_synced)
+    if merge:
+        sf_cur.execute(f"DROP TABLE IF EXISTS {target}")
+    print_progress(table_name, rows_synced, rows_synced,
+                   f"ID {last_id + 1} -> {max_id}")
     return rows_synced
 
 
-def sync_upsert_sessions(sqlite_conn, sf_conn, batch_size: int) -> int:
-    """Sync sessions via temp-table MERGE (handles inserts + updates)."""
+def sync_upsert_sessions(sqlite_conn, sf_cur, state: dict, batch_size: int,
+                         load_method: str = 'auto') -> int:
+    """Sync sessions via staged temp-table MERGE (handles inserts + updates)."""
     table_name = 'sessions'
     config = TABLE_CONFIG[table_name]
-    state = get_sync_state(sf_conn, table_name)
     last_mtime = float(state['last_synced_timestamp'] or '0')
 
-    columns = _col_names(config)
-    col_list = ', '.join(columns)
+    col_list = config['col_list']
+    tmp_table = config['tmp_table']
 
-    # Fetch changed sessions (new or updated via re-processed JSONL files)
-    sqlite_cur = sqlite_conn.execute(
-        f"SELECT {col_list} FROM sessions "
-        "WHERE file_mtime > ? OR file_mtime IS NULL "
-        "ORDER BY session_id",
-        (last_mtime,),
-    )
-    all_rows = [tuple(row) for row in sqlite_cur.fetchall()]
-    total = len(all_rows)
+    # Count changed sessions (new or updated via re-processed JSONL files)
+    total = sqlite_conn.execute(config['count_sql'], (last_mtime,)).fetchone()[0]
 
     if total == 0:
         print_progress(table_name, 0, 0)
         return 0
 
-    sf_cur = sf_conn.cursor()
-
-    # Create temp table matching sessions schema
-    sf_cur.execute("CREATE TEMPORARY TABLE IF NOT EXISTS _tmp_sessions LIKE sessions")
-
-    placeholders = ', '.join(['%s'] * len(columns))
-    tmp_insert = f"INSERT INTO _tmp_sessions ({col_list}) VALUES ({placeholders})"
-
-    non_pk_cols = [c for c in columns if c != 'session_id']
-    set_clause = ', '.join(f"target.{c} = source.{c}" for c in non_pk_cols)
-    insert_vals = ', '.join(f"source.{c}" for c in columns)
+    sqlite_cur = sqlite_conn.execute(config['select_sql'], (last_mtime,))
 
-    merge_sql = (
-        "MERGE INTO sessions AS target "
-        "USING _tmp_sessions AS source "
-        "ON target.session_id = source.session_id "
-        f"WHEN MATCHED THEN UPDATE SET {set_clause} "
-        f"WHEN NOT MATCHED THEN INSERT ({col_list}) VALUES ({insert_vals})"
-    )
-
-    rows_synced = 0
+    get_mtime = operator.itemgetter(config['col_index']['file_mtime'])
     max_mtime = last_mtime
 
-    for i in range(0, total, batch_size):
-        batch = all_rows[i:i + batch_size]
-
-        sf_cur.execute("TRUNCATE TABLE _tmp_sessions")
-        execute_with_retry(sf_cur, tmp_insert, batch, many=True)
-        execute_with_retry(sf_cur, merge_sql)
-
-        # Track max file_mtime in this batch
-        # file_mtime is at index of 'file_mtime' in columns
-        mtime_idx = columns.index('file_mtime')
-        for row in batch:
-            mtime = row[mtime_idx]
-            if mtime is not None and mtime > max_mtime:
-                max_mtime = mtime
-
-        rows_synced += len(batch)
-        print_progress(table_name, rows_synced, total)
-
-    sf_cur.execute("DROP TABLE IF EXISTS _tmp_sessions")
-    sf_cur.close()
-
-    update_sync_state(sf_conn, table_name,
-                      last_synced_timestamp=str(max_mtime),
-                      rows_synced=rows_synced)
+    def on_batch(rows_staged, batch):
+        nonlocal max_mtime
+        # NULL/0 mtimes can never raise the watermark, so filter(None) drops them
+        batch_max = max(filter(None, map(get_mtime, batch)), default=max_mtime)
+        if batch_max > max_mtime:
+            max_mtime = batch_max
+        print_progress(table_name, rows_staged, total)
+
+    copy = use_copy(load_method, total)
+    with contextlib.closing(iter_batches(sqlite_cur, batch_size)) as batches:
+        if copy:
+            rows_synced = stage_rows(sf_cur, table_name, batches, on_batch)
+
+        # Load everything into a temp table matching the sessions schema, then
+        # apply inserts + updates with one MERGE
+        execute_with_retry(
+            sf_cur, f"CREATE OR REPLACE TEMPORARY TABLE {tmp_table} LIKE sessions"
+        )
+        if not copy:
+            rows_synced = insert_rows(sf_cur, tmp_table, config, batches, on_batch)
+        elif rows_synced:
+            rows_synced = copy_staged(sf_cur, table_name, tmp_table, col_list)
+    with transaction(sf_cur):
+        execute_with_retry(sf_cur, config['merge_sql'])
+        update_sync_state(sf_cur, table_name,
+                          last_synced_timestamp=str(max_mtime),
+                          rows_synced=rows_synced)
+    sf_cur.execute(f"DROP TABLE IF EXISTS {tmp_table}")
     return rows_synced
 
 
-def sync_full_replace(sqlite_conn, sf_conn, table_name: str,
-                      config: dict, batch_size: int) -> int:
-    """Delete all rows in Snowflake and reload from SQLite."""
-    columns = _col_names(config)
-    col_list = ', '.join(columns)
-
-    sqlite_cur = sqlite_conn.execute(f"SELECT {col_list} FROM {table_name}")
-    all_rows = [tuple(row) for row in sqlite_cur.fetchall()]
-    total = len(all_rows)
-
-    sf_cur = sf_conn.cursor()
-
-    # Wrap in transaction so consumers never see empty table
-    execute_with_retry(sf_cur, "BEGIN")
-    execute_with_retry(sf_cur, f"DELETE FROM {table_name}")
-
-    if total > 0:
-        placeholders = ', '.join(['%s'] * len(columns))
-        insert_sql = f"INSERT INTO {table_name} ({col_list}) VALUES ({placeholders})"
-
-        rows_done = 0
-        for i in range(0, total, batch_size):
-            batch = all_rows[i:i + batch_size]
-            execute_with_retry(sf_cur, insert_sql, batch, many=True)
-            rows_done += len(batch)
-            print_progress(table_name, rows_done, total, 'replacing')
-
-    execute_with_retry(sf_cur, "COMMIT")
-    sf_cur.close()
-
-    update_sync_state(sf_conn, table_name, rows_synced=total)
-
-    if total == 0:
+def sync_full_replace(sqlite_conn, sf_cur, table_name: str,
+                      config: dict, batch_size: int,
+                      load_method: str = 'auto') -> int:
+    """Reload a table from SQLite into a copy, then swap it in atomically."""
+    col_list = config['col_list']
+
+    total = sqlite_conn.execute(config['count_sql']).fetchone()[0]
+
+    def on_batch(rows_staged, batch):
+        print_progress(table_name, rows_staged, total, 'replacing')
+
+    copy = use_copy(load_method, total)
+    file_format = CSV_FILE_FORMAT
+    with contextlib.ExitStack() as stack:
+        if load_method == 'export':
+            file_format = EXPORT_FILE_FORMAT
+            staged = export_rows(sqlite_conn, sf_cur, table_name,
+                                 config['export_select'])
+            rows_loaded = 0
+        else:
+            # Only the Python load paths read rows through a SQLite cursor
+            batches = stack.enter_context(contextlib.closing(iter_batches(
+                sqlite_conn.execute(config['select_sql']), batch_size
+            )))
+            if copy:
+                rows_loaded = stage_rows(sf_cur, table_name, batches, on_batch)
+                staged = rows_loaded > 0
+
+        # Load a fresh copy and SWAP it in, so consumers never see an empty or
+        # half-loaded table and the old rows never need a DELETE scan. LIKE
+        # keeps constraints and defaults; COPY GRANTS keeps privileges across
+        # the swap.
+        swap_table = config['swap_table']
+        execute_with_retry(
+            sf_cur,
+            f"CREATE OR REPLACE TABLE {swap_table} LIKE {table_name} COPY GRANTS",
+        )
+        try:
+            if not copy:
+                rows_loaded = insert_rows(sf_cur, swap_table, config, batches,
+                                          on_batch)
+            elif staged:
+                rows_loaded = copy_staged(sf_cur, table_name, swap_table, col_list,
+                                          file_format)
+            execute_with_retry(sf_cur,
+                               f"ALTER TABLE {table_name} SWAP WITH {swap_table}")
+        finally:
+            sf_cur.execute(f"DROP TABLE IF EXISTS {swap_table}")
+    update_sync_state(sf_cur, table_name, rows_synced=rows_loaded)
+
+    if rows_loaded == 0:
         print_progress(table_name, 0, 0)
+    elif load_method == 'export':
+        print_progress(table_name, rows_loaded, rows_loaded, 'replacing')
 
-    return total
+    return rows_loaded
 
 
 # ---------------------------------------------------------------------------
 # Dispatch
 # ---------------------------------------------------------------------------
 
-def sync_table(sqlite_conn, sf_conn, table_name: str,
-               batch_size: int) -> int:
-    """Dispatch to the correct sync strategy for a table."""
+def sync_table(sqlite_conn, sf_cur, table_name: str,
+               batch_size: int, state: dict = None,
+               load_method: str = 'auto', merge: bool = False,
+               high_id: int = None) -> int:
+    """Dispatch to the correct sync strategy for a table.
+
+    state is the table's _sync_state row (see get_sync_states); it is read
+    here when not supplied. high_id bounds id-keyed tables (see get_high_ids).
+    """
     config = TABLE_CONFIG[table_name]
     strategy = config['strategy']
+    batch_size = min(batch_size, config.get('max_batch_size', batch_size))
+    if state is None:
+        state = get_sync_states(sf_cur).get(table_name, EMPTY_SYNC_STATE)
 
     if strategy == 'incremental_id':
-        return sync_incremental_by_id(sqlite_conn, sf_conn,
-                                      table_name, config, batch_size)
+        return sync_incremental_by_id(sqlite_conn, sf_cur, table_name, config,
+                                      state, batch_size, load_method, merge,
+                                      high_id)
     elif strategy == 'upsert':
-        return sync_upsert_sessions(sqlite_conn, sf_conn, batch_size)
+        return sync_upsert_sessions(sqlite_conn, sf_cur, state, batch_size,
+                                    load_method)
     elif strategy == 'full_replace':
-        return sync_full_replace(sqlite_conn, sf_conn,
-                                 table_name, config, batch_size)
+        return sync_full_replace(sqlite_conn, sf_cur, table_name, config,
+                                 batch_size, load_method)
     else:
         raise ValueError(f"Unknown sync strategy '{strategy}' for {table_name}")
 
 
-def get_pending_count(sqlite_conn, sf_conn, table_name: str) -> tuple:
-    """Return (count, description) of rows that would be synced."""
-    config = TABLE_CONFIG[table_name]
-    strategy = config['strategy']
+class ConnectionPool:
+    """(SQLite connection, Snowflake cursor) pairs shared by sync workers.
 
-    if strategy == 'incremental_id':
-        state = get_sync_state(sf_conn, table_name)
-        last_id = state['last_synced_id'] or 0
-        count = sqlite_conn.execute(
-            f"SELECT COUNT(*) FROM {table_name} WHERE id > ?", (last_id,)
-        ).fetchone()[0]
-        return count, f"new rows (id > {last_id})"
+    Seeded with the main connections; extra pairs (each on its own Snowflake
+    connection) are opened on demand and kept until close(), so repeated
+    runs in --watch mode reuse the same sessions.
+    """
 
-    elif strategy == 'upsert':
-        state = get_sync_state(sf_conn, table_name)
-        last_mtime = float(state['last_synced_timestamp'] or '0')
-        count = sqlite_conn.execute(
-            f"SELECT COUNT(*) FROM {table_name} "
-            "WHERE file_mtime > ? OR file_mtime IS NULL",
-            (last_mtime,),
-        ).fetchone()[0]
-        return count, "new/updated rows"
+    def __init__(self, sqlite_conn, sf_cur):
+        self._idle = SimpleQueue()
+        self._idle.put((sqlite_conn, sf_cur))
+        self._opened = []
+        self._lock = threading.Lock()
 
-    elif strategy == 'full_replace':
-        count = sqlite_conn.execute(
-            f"SELECT COUNT(*) FROM {table_name}"
-        ).fetchone()[0]
-        return count, "rows (full replace)"
+    def acquire(self) -> tuple:
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        extra_sqlite, extra_sf = get_sqlite_connection(), get_snowflake_connection()
+        with self._lock:
+            self._opened.append((extra_sqlite, extra_sf))
+        return extra_sqlite, extra_sf.cursor()
+
+    def release(self, conns: tuple):
+        self._idle.put(conns)
+
+    def close(self):
+        """Close the extra connections; the seeding pair is left to the caller."""
+        with self._lock:
+            for extra_sqlite, extra_sf in self._opened:
+                extra_sqlite.close()
+                extra_sf.close()
+            self._opened.clear()
+
+
+def sync_tables(pool: ConnectionPool, tables: list, batch_size: int,
+                max_workers: int = SYNC_MAX_WORKERS, verbose: bool = False,
+                load_method: str = 'auto', merge: bool = False,
+                profiles: list = None) -> tuple:
+    """Sync tables concurrently, starting each once its dependencies finish.
+
+    Workers borrow a (SQLite connection, Snowflake cursor) pair from the pool.
+    If a profiles list is given, each table's sync runs under its own
+    cProfile.Profile, which is appended to it.
+    Returns (total_rows, errors, timings): errors is a list of TableError
+    (with the traceback filled in when verbose); timings maps each synced
+    table to (rows, elapsed_ns).
+    """
+    waiting_on = {
+        t: {d for d in TABLE_CONFIG[t]['depends_on'] if d in tables}
+        for t in tables
+    }
+    conns = pool.acquire()
+    try:
+        states = get_sync_states(conns[1])
+        high_ids = get_high_ids(conns[0], tables)
+    except Exception as e:
+        # Every table needs these reads, so each one fails for this run
+        print(f"\n  ERROR reading sync state: {e}")
+        return 0, [table_error(table, e, verbose) for table in tables], {}
+    finally:
+        pool.release(conns)
 
-    return 0, "unknown strategy"
+    def run(table):
+        conns = pool.acquire()
+        start_ns = time.perf_counter_ns()
+        try:
+            sync = functools.partial(
+                sync_table, conns[0], conns[1], table, batch_size,
+                states.get(table, EMPTY_SYNC_STATE), load_method, merge,
+                high_ids.get(table),
+            )
+            with tracking_progress():
+                if profiles is None:
+                    rows = sync()
+                else:
+                    profiler = cProfile.Profile()
+                    profiles.append(profiler)
+                    rows = profiler.runcall(sync)
+            return rows, time.perf_counter_ns() - start_ns
+        finally:
+            pool.release(conns)
+
+    # Results are collected on this thread as futures finish, so the totals,
+    # error list and timings need no locking
+    total_rows = 0
+    errors = []
+    timings = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tables) or 1)) as executor:
+        while waiting_on or running:
+            for table in [t for t, deps in waiting_on.items() if not deps]:
+                del waiting_on[table]
+                running[executor.submit(run, table)] = table
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = running.pop(future)
+                for deps in waiting_on.values():
+                    deps.discard(table)
+                try:
+                    timings[table] = future.result()
+                    total_rows += timings[table][0]
+                except Exception as e:
+                    print(f"\n  ERROR syncing {table}: {e}")
+                    errors.append(table_error(table, e, verbose))
+
+    return total_rows, errors, timings
+
+
+def get_high_ids(sqlite_conn, tables: list) -> dict:
+    """Return {table: MAX(id)} for the id-keyed tables, read as one snapshot.
+
+    A single statement runs in a single read transaction, so the bounds are a
+    consistent cut taken before any table syncs. Parents read later (sessions
+    before turns, turns before tool_calls) then always include every row the
+    bounded children can reference, without holding a read transaction open
+    across the whole run.
+    """
+    parts = [
+        f"SELECT '{t}', ({TABLE_CONFIG[t]['high_id_sql']})"
+        for t in tables if TABLE_CONFIG[t]['strategy'] == 'incremental_id'
+    ]
+    if not parts:
+        return {}
+    return dict(sqlite_conn.execute(' UNION ALL '.join(parts)))
+
+
+# A failed table (or 'dry-run') as reported in the run summary
+TableError = collections.namedtuple('TableError', ('table', 'message', 'traceback'))
+
+
+def table_error(table: str, e: Exception, verbose: bool = False) -> TableError:
+    """Record a failure; the traceback is only formatted when verbose."""
+    tb = ''
+    if verbose:
+        tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+    return TableError(table, str(e), tb)
+
+
+def get_pending_counts(sqlite_conn, tables: list, states: dict) -> dict:
+    """Return {table: (count, description)} of rows that would be synced.
+
+    All tables are counted with a single UNION ALL query against SQLite.
+    """
+    parts = []
+    params = []
+    for table_name in tables:
+        config = TABLE_CONFIG[table_name]
+        if config['strategy'] == 'incremental_id':
+            parts.append(f"SELECT '{table_name}', ({config['high_id_sql']})")
+        else:
+            parts.append(f"SELECT '{table_name}', ({config['count_sql']})")
+            if config['strategy'] == 'upsert':
+                state = states.get(table_name, EMPTY_SYNC_STATE)
+                params.append(float(state['last_synced_timestamp'] or '0'))
+
+    counts = {}
+    for table_name, value in sqlite_conn.execute(' UNION ALL '.join(parts), params):
+        strategy = TABLE_CONFIG[table_name]['strategy']
+        if strategy == 'incremental_id':
+            # Same MAX(id) upper bound the sync itself uses (ids may have gaps)
+            last_id = states.get(table_name, EMPTY_SYNC_STATE)['last_synced_id'] or 0
+            counts[table_name] = (max((value or 0) - last_id, 0),
+                                  f"new rows, at most (id > {last_id})")
+        elif strategy == 'upsert':
+            counts[table_name] = (value, "new/updated rows")
+        else:
+            counts[table_name] = (value, "rows (full replace)")
+    return counts
 
 
 # ---------------------------------------------------------------------------
 # --status command
 # ---------------------------------------------------------------------------
 
-def show_status(sf_conn):
+def show_status(sf_cur):
     """Print current sync state from _sync_state table."""
-    cursor = sf_conn.cursor()
     try:
-        cursor.execute(
+        sf_cur.execute(
             "SELECT table_name, last_synced_id, last_synced_timestamp, "
             "rows_synced, last_sync_at "
-            "FROM _sync_state ORDER BY table_name"
+            "FROM _sync_state WHERE table_name <> ? ORDER BY table_name",
+            (SCHEMA_VERSION_KEY,),
         )
-        rows = cursor.fetchall()
+        rows = sf_cur.fetchall()
     except snowflake.connector.errors.ProgrammingError:
         print("No sync state found. Run the sync first.")
-        cursor.close()
         return
 
-    cursor.close()
-
     if not rows:
         print("No sync state found. Run the sync first.")
         return
@@ -785,7 +1500,33 @@ def create_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
-        help=f'Batch size for inserts (default: {DEFAULT_BATCH_SIZE})',
+        help=f'Rows read from SQLite per batch (default: {DEFAULT_BATCH_SIZE})',
+    )
+    parser.add_argument(
+        '--parallelism', type=int, default=SYNC_MAX_WORKERS,
+        help=('Tables synced concurrently, each on its own Snowflake '
+              f'connection (default: {SYNC_MAX_WORKERS})'),
+    )
+    parser.add_argument(
+        '--load-method', choices=LOAD_METHODS, default='auto',
+        help=('How rows are loaded: staged PUT + COPY INTO, bound INSERTs, '
+              'COPY of a sqlite3 CLI export, or auto (COPY from '
+              f'{COPY_MIN_ROWS:,} pending rows up; default)'),
+    )
+    parser.add_argument(
+        '--merge', action='store_true',
+        help=('MERGE new rows of id-keyed tables on id instead of appending, '
+              'so rows already in Snowflake are never duplicated'),
+    )
+    parser.add_argument(
+        '--watch', type=int, metavar='SECONDS',
+        help=('Keep the Snowflake session open and re-sync every SECONDS '
+              'until interrupted, instead of reconnecting on each run'),
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help=('Profile each table\'s sync with cProfile (tables run one at a '
+              'time) and write the stats to sync-<timestamp>.pstats'),
     )
     parser.add_argument(
         '--verbose', '-v', action='store_true',
@@ -802,6 +1543,18 @@ def create_parser() -> argparse.ArgumentParser:
 def main():
     parser = create_parser()
     args = parser.parse_args()
+    if snowflake is None:
+        print(
+            "Missing dependencies. Install with:\n"
+            "  python -m pip install snowflake-connector-python cryptography"
+        )
+        sys.exit(1)
+    if args.parallelism < 1:
+        parser.error("--parallelism must be at least 1")
+    if args.watch is not None and args.watch < 1:
+        parser.error("--watch must be at least 1 second")
+    if args.load_method == 'export' and not shutil.which('sqlite3'):
+        parser.error("--load-method export needs the sqlite3 command-line shell on PATH")
 
     # Connect to Snowflake
     try:
@@ -813,9 +1566,13 @@ def main():
         print(f"Snowflake connection failed: {e}")
         sys.exit(1)
 
+    # One cursor serves every statement on this connection
+    sf_cur = sf_conn.cursor()
+
     # --status: show state and exit
     if args.status:
-        show_status(sf_conn)
+        show_status(sf_cur)
+        sf_cur.close()
         sf_conn.close()
         return
 
@@ -824,6 +1581,7 @@ def main():
         sqlite_conn = get_sqlite_connection()
     except FileNotFoundError as e:
         print(f"Error: {e}")
+        sf_cur.close()
         sf_conn.close()
         sys.exit(1)
 
@@ -838,8 +1596,9 @@ def main():
     database = os.environ.get('SNOWFLAKE_DATABASE', '?')
     schema = os.environ.get('SNOWFLAKE_SCHEMA', '?')
 
-    from ccwap.config.loader import load_config, get_database_path
-    db_path = get_database_path(load_config())
+    db_path = get_db_path()
+    if not args.dry_run:
+        ensure_sqlite_wal(db_path)
 
     print("CCWAP Snowflake Sync")
     print("=" * 40)
@@ -849,61 +1608,114 @@ def main():
 
     # Set up Snowflake database/schema
     if not args.dry_run:
-        ensure_snowflake_schema(sf_conn)
+        if _needs_schema_bootstrap(sf_cur):
+            ensure_snowflake_schema(sf_cur)
 
         # --full-reload
         if args.full_reload:
             print("Full reload: dropping and recreating tables...")
-            drop_tables(sf_conn, tables_to_sync)
-            ensure_snowflake_schema(sf_conn)
+            drop_tables(sf_cur, tables_to_sync)
+            ensure_snowflake_schema(sf_cur)
             print()
     else:
-        _use_database(sf_conn)  # Best-effort; dry-run works even without DB
+        _use_database(sf_cur)  # Best-effort; dry-run works even without DB
+
+    pool = ConnectionPool(sqlite_conn, sf_cur)
+    run_count = 0
+    errors = []
+    try:
+        while True:
+            run_count += 1
+            errors = run_sync(args, pool, sqlite_conn, sf_cur, tables_to_sync, run_count)
+            if not args.watch:
+                break
+            print(f"\nNext sync in {args.watch}s (Ctrl+C to stop)...\n")
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        pool.close()
+        sqlite_conn.close()
+        sf_cur.close()
+        sf_conn.close()
+
+    if errors and not args.watch:
+        sys.exit(1)
+
 
-    # Sync
-    start_time = time.time()
+def run_sync(args, pool: ConnectionPool, sqlite_conn, sf_cur,
+             tables_to_sync: list, run_count: int) -> list:
+    """Run one dry-run or sync pass and print its summary. Returns the errors."""
+    # perf_counter is monotonic, so NTP clock steps can't skew the timings
+    start_ns = time.perf_counter_ns()
     total_rows = 0
     errors = []
+    timings = {}
 
     mode = "Dry run" if args.dry_run else "Syncing"
     print(f"{mode}: {len(tables_to_sync)} table(s)...\n")
 
-    for table in tables_to_sync:
+    if args.dry_run:
         try:
-            if args.dry_run:
-                count, desc = get_pending_count(sqlite_conn, sf_conn, table)
+            counts = get_pending_counts(sqlite_conn, tables_to_sync,
+                                        get_sync_states(sf_cur))
+            for table in tables_to_sync:
+                count, desc = counts[table]
                 print(f"  {table:<20} {count:>8,} {desc}")
-            else:
-                rows = sync_table(sqlite_conn, sf_conn, table, args.batch_size)
-                total_rows += rows
         except Exception as e:
-            errors.append((table, str(e)))
-            print(f"\n  ERROR syncing {table}: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+            print(f"\n  ERROR counting pending rows: {e}")
+            errors.append(table_error('dry-run', e, args.verbose))
+    else:
+        # Freshly reloaded tables are empty, so the first pass of a
+        # --full-reload has nothing to MERGE against
+        merge = args.merge and not (args.full_reload and run_count == 1)
+        # Profiled tables run one at a time: from Python 3.12 cProfile is
+        # interpreter-wide and only one profiler can be active at once
+        profiles = [] if args.profile else None
+        # Failures end this pass, never the --watch loop; the next pass retries
+        try:
+            total_rows, errors, timings = sync_tables(
+                pool, tables_to_sync, args.batch_size,
+                max_workers=1 if args.profile else args.parallelism,
+                verbose=args.verbose, load_method=args.load_method, merge=merge,
+                profiles=profiles,
+            )
+        except Exception as e:
+            print(f"\n  ERROR syncing: {e}")
+            errors.append(table_error('sync', e, args.verbose))
+        if profiles:
+            profile_path = f"sync-{time.strftime('%Y%m%d-%H%M%S')}.pstats"
+            pstats.Stats(*profiles).dump_stats(profile_path)
 
-    elapsed = time.time() - start_time
+    elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+    reuse = f" (run {run_count} on this session)" if args.watch else ""
 
     # Summary
     print()
     if args.dry_run:
-        print(f"Dry run complete in {elapsed:.1f}s")
+        print(f"Dry run complete in {elapsed:.1f}s{reuse}")
     else:
-        print(f"Sync complete in {elapsed:.1f}s")
+        print(f"Sync complete in {elapsed:.1f}s{reuse}")
         print(f"  Total rows synced: {total_rows:,}")
         print(f"  Errors: {len(errors)}")
+        if timings:
+            print()
+            for table in tables_to_sync:
+                if table in timings:
+                    rows, elapsed_ns = timings[table]
+                    print(f"  {table:<20} {rows:>10,}  {elapsed_ns / 1e6:>9.1f} ms")
+        if profiles:
+            print(f"\n  Profile written to {profile_path} "
+                  f"(view with: python -m pstats {profile_path})")
 
     if errors:
         print("\nFailed tables:")
-        for table, err in errors:
-            print(f"  {table}: {err}")
-
-    sqlite_conn.close()
-    sf_conn.close()
+        for error in errors:
+            print(f"  {error.table}: {error.message}")
+            if error.traceback:
+                print(error.traceback.rstrip())
 
-    if errors:
-        sys.exit(1)
+    return errors
 
 
 if __name__ == '__main__':